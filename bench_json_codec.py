@@ -0,0 +1,80 @@
+"""Time saving and loading a synthetic ledger with each installed JSON codec.
+
+    python bench_json_codec.py [rows]
+
+Files are written to a temporary directory, your data is not touched.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from budget_tracker import JSON_CODECS, JsonCodec, JsonStorage
+
+
+def synthetic_ledger(rows, seed=1):
+    """Transaction dicts spread over ten years, newest first"""
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=3650)
+    categories = ['salary', 'food', 'rent', 'utilities', 'entertainment', 'other', '']
+    ledger = []
+    for i in range(rows):
+        ledger.append({
+            'id': f"{i:08d}",
+            'amount': round(rng.uniform(1, 5000), 2),
+            'type': rng.choice(['income', 'expense', 'expense', 'expense']),
+            'category': rng.choice(categories),
+            'description': f"Synthetic transaction {i}",
+            'date': (first_day + timedelta(days=rng.randrange(3650))).isoformat(),
+            'currency': rng.choice(['CZK', 'CZK', 'EUR', 'USD'])
+        })
+    ledger.sort(key=lambda t: t['date'], reverse=True)
+    return ledger
+
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    ledger = synthetic_ledger(rows)
+    budgets = {category: {'amount': 5000.0, 'period': 'monthly', 'currency': 'CZK'}
+               for category in ['food', 'rent', 'utilities', 'entertainment', 'other']}
+
+    codecs = []
+    for name in JSON_CODECS:
+        try:
+            codecs.append(JsonCodec(name))
+        except ImportError:
+            print(f"{name} is not installed, skipped")
+
+    print(f"{rows:,} transactions, best of 3")
+    print(f"{'codec':<10}{'save':>10}{'load':>10}{'file size':>14}")
+    loaded = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for codec in codecs:
+            os.chdir(directory)
+            storage = JsonStorage(codec=codec)
+            save = best_of(3, lambda: storage.save_transactions(ledger))
+            load = best_of(3, lambda: loaded.__setitem__(codec.name, storage.load_transactions()))
+            storage.save_budgets(budgets)
+            assert storage.load_budgets() == budgets
+            size = os.path.getsize(storage.journal.snapshot_path)
+            print(f"{codec.name:<10}{save:>9.2f}s{load:>9.2f}s{size / 1e6:>11.1f} MB")
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    # Every codec reads back exactly what was written
+    for name, transactions in loaded.items():
+        assert transactions == ledger, name
+
+
+if __name__ == "__main__":
+    main()
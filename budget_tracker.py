@@ -1,28 +1,198 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
+from datetime import datetime, date
+import copy
 import json
+import math
+import multiprocessing
 import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, KeepTogether
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+# matplotlib, ReportLab and requests are imported where they are first
+# needed, they make up most of the start-up time otherwise
 from tkcalendar import DateEntry
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from collections import defaultdict
-import tempfile
+import numpy as np
+from array import array
+from bisect import bisect_left, bisect_right
+from io import BytesIO
+from xml.sax.saxutils import escape
+from itertools import accumulate, chain, islice
+from operator import attrgetter
 from calendar import monthrange
 from datetime import datetime, timedelta
-import requests
-from functools import lru_cache
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+SQLITE_DB_PATH = 'budget_tracker.db'
+
+# How often the background refresh checks whether cached rates have expired
+RATE_REFRESH_INTERVAL_MS = 60 * 60 * 1000
+# Exchange rates persisted between runs and how long they count as fresh
+RATE_CACHE_PATH = 'exchange_rates.json'
+RATE_CACHE_TTL = timedelta(hours=12)
+# Lifetime of a computed currency pair rate in the in-memory cache
+RATE_ENTRY_TTL = timedelta(hours=1)
+# Daily rates recorded for date-aware conversion
+RATE_HISTORY_DIR = 'rate_history'
+
+# Day zero of numpy's datetime64[D]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Ledgers longer than this only materialize the rows in the viewport
+VIRTUAL_LIST_THRESHOLD = 1000
+# Formatted rows kept around the viewport while scrolling a virtual list
+VIRTUAL_LIST_BUFFER = 50
+
+# Balance curves in reports are thinned out to about this many points
+CHART_MAX_POINTS = 2000
+# Report tables are split into tables of this many rows (kept even)
+TABLE_CHUNK_ROWS = 500
+
+# Seconds without new edits before queued saves are written, and before a
+# failed save is tried again
+WRITE_BEHIND_DELAY = 0.5
+WRITE_BEHIND_RETRY = 5.0
+
+# Transactions loaded before the window opens, and per step after that
+LOAD_FIRST_ROWS = 200
+LOAD_CHUNK_ROWS = 5000
+
+# JSON libraries for the data files, in order of preference
+JSON_CODECS = ('msgspec', 'orjson', 'json')
+
+class ExchangeRateApiSource:
+    """Latest rates from exchangerate-api.com.
+
+    Any object with a matching fetch(base_currency) method returning a
+    {currency: rate} dict can be passed to CurrencyConverter instead.
+    """
+
+    def __init__(self, base_url="https://api.exchangerate-api.com/v4/latest/", timeout=10):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def fetch(self, base_currency):
+        import requests
+
+        response = requests.get(f"{self.base_url}{base_currency}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['rates']
+
+class RateCache:
+    """Computed conversion rates, each entry valid until its expiry"""
+
+    def __init__(self, ttl=RATE_ENTRY_TTL):
+        self.ttl = ttl.total_seconds()
+        self.entries = {}  # key -> (rate, expiry on the monotonic clock)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, key, rate):
+        self.entries[key] = (rate, time.monotonic() + self.ttl)
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+class RateHistory:
+    """Daily rates of each currency against the base currency.
+
+    Each currency pair is one file of (ordinal, rate) float64 pairs sorted by
+    date. A date is answered with the latest rate recorded on or before it,
+    or the earliest rate for dates before the history starts.
+    """
+
+    def __init__(self, base_currency, directory=RATE_HISTORY_DIR):
+        self.base_currency = base_currency
+        self.directory = directory
+        self.series = {}  # currency -> (array of ordinals, array of rates)
+
+    def _path(self, currency):
+        return os.path.join(self.directory, f"{self.base_currency}_{currency}.bin")
+
+    def _load(self, currency):
+        series = self.series.get(currency)
+        if series is None:
+            data = array('d')
+            try:
+                with open(self._path(currency), 'rb') as f:
+                    data.frombytes(f.read())
+            except (OSError, ValueError):
+                data = array('d')
+            series = (array('l', map(int, data[0::2])), data[1::2])
+            self.series[currency] = series
+        return series
+
+    def _write(self, currency, records):
+        with open(self._path(currency), 'ab' if records else 'wb') as f:
+            ordinals, rates = self.series[currency]
+            if records:
+                # Appending past the end of the series
+                f.write(array('d', records).tobytes())
+            else:
+                data = array('d')
+                for ordinal, rate in zip(ordinals, rates):
+                    data.append(ordinal)
+                    data.append(rate)
+                f.write(data.tobytes())
+
+    def record(self, rates, currencies, day=None):
+        """Store the rates of `currencies` for a day (today by default)"""
+        ordinal = (day or date.today()).toordinal()
+        os.makedirs(self.directory, exist_ok=True)
+        for currency in currencies:
+            rate = rates.get(currency)
+            if currency == self.base_currency or rate is None:
+                continue
+            ordinals, series_rates = self._load(currency)
+            index = bisect_left(ordinals, ordinal)
+            if index < len(ordinals) and ordinals[index] == ordinal:
+                if series_rates[index] == rate:
+                    continue
+                series_rates[index] = rate
+                self._write(currency, None)
+            elif index == len(ordinals):
+                ordinals.append(ordinal)
+                series_rates.append(rate)
+                self._write(currency, [ordinal, rate])
+            else:
+                ordinals.insert(index, ordinal)
+                series_rates.insert(index, rate)
+                self._write(currency, None)
+
+    def rate_on(self, currency, ordinal):
+        ordinals, rates = self._load(currency)
+        if not ordinals:
+            return None
+        return rates[max(bisect_right(ordinals, ordinal) - 1, 0)]
+
+    def rates_on(self, currency, ordinals):
+        """Vectorized rate_on for a numpy array of ordinals"""
+        series_ordinals, rates = self._load(currency)
+        if not series_ordinals:
+            return None
+        index = np.searchsorted(np.array(series_ordinals), ordinals, side='right') - 1
+        return np.array(rates)[np.maximum(index, 0)]
 
 class CurrencyConverter:
-    def __init__(self):
-        self.base_url = "https://api.exchangerate-api.com/v4/latest/"
+    def __init__(self, rate_source=None, cache_path=RATE_CACHE_PATH, cache_ttl=RATE_CACHE_TTL):
+        self.rate_source = rate_source if rate_source is not None else ExchangeRateApiSource()
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
         self.currencies = {
             'CZK': 'CZK',
             'USD': '$',
@@ -31,36 +201,122 @@ class CurrencyConverter:
         self.default_currency = 'CZK'
         self.rates = {}
         self.last_update = None
-        self.update_rates()
+        self.refresh_thread = None
+        self.rate_cache = RateCache()
+        self.history = RateHistory(self.default_currency)
+        # Start from the last known rates, even stale ones beat no rates offline
+        self.load_cached_rates()
+
+    @property
+    def rates_are_fresh(self):
+        return self.last_update is not None and datetime.now() - self.last_update < self.cache_ttl
+
+    def load_cached_rates(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if data['base'] == self.default_currency:
+                self.rates = data['rates']
+                self.last_update = datetime.fromisoformat(data['timestamp'])
+                self.history.record(self.rates, self.currencies, self.last_update.date())
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save_cached_rates(self):
+        data = {
+            'base': self.default_currency,
+            'timestamp': self.last_update.isoformat(),
+            'rates': self.rates
+        }
+        try:
+            temp_path = self.cache_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            print("Failed to save exchange rate cache")
 
-    @lru_cache(maxsize=128)
     def get_rate(self, from_currency, to_currency, date=None):
+        """Conversion rate, on a given date ordinal when `date` is set"""
         if from_currency == to_currency:
             return 1.0
-        
-        if self.last_update is None or datetime.now() - self.last_update > timedelta(hours=1):
-            self.update_rates()
-            
+
+        key = (from_currency, to_currency, date)
+        rate = self.rate_cache.get(key)
+        if rate is None:
+            rate = self.compute_rate(from_currency, to_currency, date)
+            self.rate_cache.put(key, rate)
+        return rate
+
+    def base_rate(self, currency, date=None):
+        """Rate of a currency against the default currency"""
+        if currency == self.default_currency:
+            return 1.0
+        if date is not None:
+            rate = self.history.rate_on(currency, date)
+            if rate is not None:
+                return rate
+        return self.rates.get(currency, 1.0)
+
+    def compute_rate(self, from_currency, to_currency, date=None):
         try:
-            if from_currency == self.default_currency:
-                return self.rates.get(to_currency, 1.0)
-            elif to_currency == self.default_currency:
-                return 1.0 / self.rates.get(from_currency, 1.0)
-            else:
-                # Convert through USD
-                return (1.0 / self.rates.get(from_currency, 1.0)) * self.rates.get(to_currency, 1.0)
+            # Both sides are quoted against the default currency
+            return self.base_rate(to_currency, date) / self.base_rate(from_currency, date)
         except:
             return 1.0
 
+    def get_rates(self, from_currency, to_currency, ordinals):
+        """Conversion rates for a numpy array of date ordinals"""
+        if from_currency == to_currency:
+            return np.ones(len(ordinals))
+        return self._base_rates(to_currency, ordinals) / self._base_rates(from_currency, ordinals)
+
+    def _base_rates(self, currency, ordinals):
+        if currency != self.default_currency:
+            rates = self.history.rates_on(currency, ordinals)
+            if rates is not None:
+                return rates
+        return np.full(len(ordinals), self.base_rate(currency))
+
+    def fetch_rates(self):
+        """Download current rates, safe to call off the Tk thread"""
+        return self.rate_source.fetch(self.default_currency)
+
+    def apply_rates(self, rates):
+        self.rates = rates
+        self.last_update = datetime.now()
+        self.save_cached_rates()
+        self.history.record(rates, self.currencies)
+        # Drop rates computed before the refresh
+        self.rate_cache.clear()
+
     def update_rates(self):
         try:
-            response = requests.get(f"{self.base_url}{self.default_currency}")
-            data = response.json()
-            self.rates = data['rates']
-            self.last_update = datetime.now()
+            self.apply_rates(self.fetch_rates())
         except:
             print("Failed to update exchange rates")
 
+    def refresh_rates_async(self, on_done):
+        """Fetch rates on a background thread and pass them (or None) to on_done.
+
+        on_done runs on the background thread; callers hand the result over
+        to the Tk thread themselves.
+        """
+        if self.refresh_thread is not None and self.refresh_thread.is_alive():
+            return False
+
+        def worker():
+            try:
+                rates = self.fetch_rates()
+            except Exception:
+                print("Failed to update exchange rates")
+                rates = None
+            on_done(rates)
+
+        self.refresh_thread = threading.Thread(target=worker, daemon=True)
+        self.refresh_thread.start()
+        return True
+
     def format_amount(self, amount, currency):
         symbol = self.currencies.get(currency, '$')
         formatted_amount = "{:,.2f}".format(amount)  # Add commas to the number
@@ -68,19 +324,98 @@ class CurrencyConverter:
             return f"{formatted_amount} {symbol}"
         return f"{symbol}{formatted_amount}"
 
-    def convert_amount(self, amount, from_currency, to_currency):
-        rate = self.get_rate(from_currency, to_currency)
+    def convert_amount(self, amount, from_currency, to_currency, date=None):
+        rate = self.get_rate(from_currency, to_currency, date)
         return amount * rate
 
+    def convert_many(self, amounts, currencies, to_currency, dates=None, currency_names=None):
+        """Convert a whole sequence of amounts, one rate lookup per distinct currency.
+
+        With `dates` (ordinals, one per amount) each amount is converted at the
+        rate of its date. NumPy amounts are converted with a single multiply;
+        `currencies` may then hold integer codes into `currency_names`.
+        """
+        if isinstance(amounts, np.ndarray):
+            if currency_names is None:
+                currency_names, codes = np.unique(np.asarray(currencies), return_inverse=True)
+            else:
+                codes = np.asarray(currencies, dtype=np.intp)
+            if dates is not None:
+                dates = np.asarray(dates, dtype=np.int64)
+            rates = np.empty(len(amounts))
+            for code, currency in enumerate(currency_names):
+                rows = codes == code
+                if dates is None:
+                    rates[rows] = self.get_rate(str(currency), to_currency)
+                else:
+                    rates[rows] = self.get_rates(str(currency), to_currency, dates[rows])
+            return amounts * rates
+
+        if dates is None:
+            rates = {currency: self.get_rate(currency, to_currency) for currency in set(currencies)}
+            return [amount * rates[currency] for amount, currency in zip(amounts, currencies)]
+
+        rates = {}
+        converted = []
+        for amount, currency, date in zip(amounts, currencies, dates):
+            rate = rates.get((currency, date))
+            if rate is None:
+                rate = rates[(currency, date)] = self.get_rate(currency, to_currency, date)
+            converted.append(amount * rate)
+        return converted
+
 class Transaction:
+    # No per-instance __dict__, large ledgers hold one of these per row
+    __slots__ = ('id', 'amount', 'type', 'category', 'description', 'ordinal', 'currency')
+
+    _last_id = ""
+
     def __init__(self, amount, type_, category="", description="", date=None, currency="CZK"):
-        self.id = datetime.now().strftime("%Y%m%d%H%M%S")
+        self.id = Transaction.new_id()
         self.amount = float(amount)
-        self.type = type_
-        self.category = category
+        # Repeated short strings are shared instead of stored once per row
+        self.type = sys.intern(type_)
+        self.category = sys.intern(category or "")
         self.description = description
         self.date = date if date else datetime.now().strftime("%Y-%m-%d")
-        self.currency = currency
+        self.currency = sys.intern(currency)
+
+    @property
+    def date(self):
+        # Only the ordinal is stored, the string form is for display and serialization
+        return date.fromordinal(self.ordinal).isoformat()
+
+    @date.setter
+    def date(self, value):
+        # Parsed once here so sorting and range filters compare integers
+        try:
+            self.ordinal = date.fromisoformat(value).toordinal()
+        except ValueError:
+            self.ordinal = datetime.strptime(value, "%Y-%m-%d").toordinal()
+
+    @staticmethod
+    def new_id():
+        # Journal records refer to transactions by id, so ids must be unique
+        # even when several transactions are created within the same microsecond
+        new_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        if new_id <= Transaction._last_id:
+            new_id = str(int(Transaction._last_id) + 1)
+        Transaction._last_id = new_id
+        return new_id
+
+    @classmethod
+    def from_dict(cls, t_dict):
+        # Skips __init__, minting an id per row only to overwrite it is slow
+        t = cls.__new__(cls)
+        t.id = t_dict['id']
+        t.amount = float(t_dict['amount'])
+        t.type = sys.intern(t_dict['type'])
+        t.category = sys.intern(t_dict['category'] or "")
+        t.description = t_dict['description']
+        t.date = t_dict['date'] or datetime.now().strftime("%Y-%m-%d")
+        # Set currency to CZK if not present in the data
+        t.currency = sys.intern(t_dict.get('currency', 'CZK'))
+        return t
 
     def to_dict(self):
         return {
@@ -93,6 +428,1259 @@ class Transaction:
             'currency': self.currency
         }
 
+class TransactionStore:
+    """Column-oriented copy of the ledger for analytics.
+
+    Amounts and date ordinals are kept in flat arrays, and type, category and
+    currency as small integer codes into lists of distinct values. Indexing
+    the store materializes a Transaction row object. Rows stay in date order,
+    so single changes are applied with `insert` and `remove`.
+    """
+
+    def __init__(self, transactions=()):
+        # Built column by column with C-level map() passes, not row by row
+        transactions = list(transactions)
+        self.ids = list(map(attrgetter('id'), transactions))
+        self.descriptions = list(map(attrgetter('description'), transactions))
+        self.amounts = array('d', map(attrgetter('amount'), transactions))
+        self.ordinals = array('l', map(attrgetter('ordinal'), transactions))
+        self._codes = {}
+        self.types, self.type_codes = self._encode('type', transactions)
+        self.categories, self.category_codes = self._encode('category', transactions)
+        self.currencies, self.currency_codes = self._encode('currency', transactions)
+
+    def _encode(self, column, transactions):
+        """Distinct values of a column in order of appearance, and each row's code"""
+        cells = list(map(attrgetter(column), transactions))
+        values = list(dict.fromkeys(cells))
+        codes = self._codes[column] = {value: code for code, value in enumerate(values)}
+        return values, array('H', map(codes.__getitem__, cells))
+
+    def _code(self, column, values, value):
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, t):
+        self.insert(len(self), t)
+
+    def insert(self, index, t):
+        self.ids.insert(index, t.id)
+        self.descriptions.insert(index, t.description)
+        self.amounts.insert(index, t.amount)
+        self.ordinals.insert(index, t.ordinal)
+        self.type_codes.insert(index, self._code('type', self.types, t.type))
+        self.category_codes.insert(index, self._code('category', self.categories, t.category))
+        self.currency_codes.insert(index, self._code('currency', self.currencies, t.currency))
+
+    def remove(self, t):
+        """Remove the row of a transaction, looked up by its date and id"""
+        low = bisect_left(self.ordinals, t.ordinal)
+        high = bisect_right(self.ordinals, t.ordinal)
+        index = self.ids.index(t.id, low, high)
+        for column in (self.ids, self.descriptions, self.amounts, self.ordinals,
+                       self.type_codes, self.category_codes, self.currency_codes):
+            del column[index]
+
+    def copy(self):
+        """Independent copy, e.g. for a report built while the ledger changes"""
+        store = TransactionStore.__new__(TransactionStore)
+        for name in ('ids', 'descriptions', 'amounts', 'ordinals', 'type_codes', 'category_codes',
+                     'currency_codes', 'types', 'categories', 'currencies'):
+            setattr(store, name, getattr(self, name)[:])
+        store._codes = {column: dict(codes) for column, codes in self._codes.items()}
+        return store
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        t = Transaction.__new__(Transaction)
+        t.id = self.ids[index]
+        t.amount = self.amounts[index]
+        t.type = self.types[self.type_codes[index]]
+        t.category = self.categories[self.category_codes[index]]
+        t.description = self.descriptions[index]
+        t.ordinal = self.ordinals[index]
+        t.currency = self.currencies[self.currency_codes[index]]
+        return t
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+class AnalyticsEngine:
+    """Vectorized chart data over a TransactionStore.
+
+    `amounts` holds every row already converted to the display currency.
+    """
+
+    def __init__(self, store, amounts):
+        self.store = store
+        self.amounts = np.asarray(amounts, dtype=float)
+        self.ordinals = np.array(store.ordinals, dtype=np.int64)
+        self.type_codes = np.array(store.type_codes, dtype=np.intp)
+        self.category_codes = np.array(store.category_codes, dtype=np.intp)
+        self.is_income = self._type_mask('income')
+        self.is_expense = self._type_mask('expense')
+
+    def _type_mask(self, type_):
+        if type_ not in self.store.types:
+            return np.zeros(len(self.type_codes), dtype=bool)
+        return self.type_codes == self.store.types.index(type_)
+
+    def balance_history(self):
+        """Dates (datetime64) and running balance, oldest first"""
+        signed = np.where(self.is_income, self.amounts, -self.amounts)
+        dates = (self.ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+        return dates, np.cumsum(signed)
+
+    def income_and_expenses(self):
+        return float(self.amounts[self.is_income].sum()), float(self.amounts[self.is_expense].sum())
+
+    def category_expenses(self):
+        """Expense totals per category, uncategorized expenses grouped together"""
+        size = len(self.store.categories)
+        totals = np.bincount(self.category_codes, weights=self.amounts * self.is_expense, minlength=size)
+        counts = np.bincount(self.category_codes[self.is_expense], minlength=size)
+        category_expenses = defaultdict(float)
+        for code in np.flatnonzero(counts):
+            category_expenses[self.store.categories[code] or 'Uncategorized'] += float(totals[code])
+        return category_expenses
+
+class TransactionTotals:
+    """Running income/expense totals per currency, updated by deltas"""
+
+    def __init__(self, transactions=()):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        for t in transactions:
+            self.add(t)
+
+    def add(self, t):
+        key = (t.type, t.currency)
+        self.totals[key] += t.amount
+        self.counts[key] += 1
+
+    def remove(self, t):
+        key = (t.type, t.currency)
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            # Drop the key so float rounding from deltas can't accumulate
+            del self.totals[key]
+            del self.counts[key]
+        else:
+            self.totals[key] -= t.amount
+
+    def rows(self):
+        """Rows of (type, currency, total amount)"""
+        return [(type_, currency, total) for (type_, currency), total in self.totals.items()]
+
+class SpendingIndex:
+    """Expense amounts per category, sorted by date ordinal, with prefix sums.
+
+    The spending of a category between two dates is two binary searches and
+    one subtraction. Prefix sums are rebuilt lazily, and only for categories
+    that changed since the last query. `convert` maps a transaction to the
+    amount that is indexed, e.g. its value in CZK on the transaction date.
+    """
+
+    def __init__(self, transactions=(), convert=None):
+        self.convert = convert if convert is not None else (lambda t: t.amount)
+        self.ordinals = defaultdict(lambda: array('l'))
+        self.amounts = defaultdict(lambda: array('d'))
+        self.prefix_sums = {}
+        for t in transactions:
+            self.add(t)
+
+    def add(self, t):
+        if t.type != 'expense':
+            return
+        ordinal = t.ordinal
+        ordinals = self.ordinals[t.category]
+        index = bisect_right(ordinals, ordinal)
+        ordinals.insert(index, ordinal)
+        self.amounts[t.category].insert(index, self.convert(t))
+        self.prefix_sums.pop(t.category, None)
+
+    def remove(self, t):
+        if t.type != 'expense':
+            return
+        ordinal = t.ordinal
+        ordinals = self.ordinals[t.category]
+        amounts = self.amounts[t.category]
+        # Any entry with the same date and amount is interchangeable
+        amount = self.convert(t)
+        for index in range(bisect_left(ordinals, ordinal), bisect_right(ordinals, ordinal)):
+            if math.isclose(amounts[index], amount):
+                del ordinals[index]
+                del amounts[index]
+                break
+        self.prefix_sums.pop(t.category, None)
+
+    def total(self, category, start_ordinal, end_ordinal):
+        """Sum of expenses in a category between two date ordinals, inclusive"""
+        if category not in self.ordinals:
+            return 0
+        prefix_sums = self.prefix_sums.get(category)
+        if prefix_sums is None:
+            prefix_sums = array('d', accumulate(self.amounts[category], initial=0.0))
+            self.prefix_sums[category] = prefix_sums
+        ordinals = self.ordinals[category]
+        low = bisect_left(ordinals, start_ordinal)
+        high = bisect_right(ordinals, end_ordinal)
+        return prefix_sums[high] - prefix_sums[low]
+
+class JsonCodec:
+    """Encodes the data files to and from UTF-8 JSON bytes.
+
+    Uses the first installed library in JSON_CODECS unless one is named.
+    They all read and write plain JSON, so files stay interchangeable, and
+    all of them raise a ValueError for malformed input.
+    """
+
+    def __init__(self, name=None):
+        for candidate in JSON_CODECS if name is None else (name,):
+            try:
+                self.dumps, self.loads = self._functions(candidate)
+            except ImportError:
+                if name is not None:
+                    raise
+                continue
+            self.name = candidate
+            break
+
+    @staticmethod
+    def _functions(name):
+        if name == 'orjson':
+            import orjson
+            return orjson.dumps, orjson.loads
+        if name == 'msgspec':
+            import msgspec
+            return msgspec.json.encode, msgspec.json.decode
+        if name == 'json':
+            return (lambda data: json.dumps(data).encode()), json.loads
+        raise ValueError(f"Unknown JSON codec: {name}")
+
+_json_codec = None
+
+def get_json_codec():
+    """The fastest available codec, picked on first use"""
+    global _json_codec
+    if _json_codec is None:
+        _json_codec = JsonCodec()
+    return _json_codec
+
+def write_json_atomic(path, data, codec=None):
+    """Write JSON to a temporary file and move it over path, so readers
+    never see a half-written file"""
+    codec = codec or get_json_codec()
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(codec.dumps(data))
+    os.replace(temp_path, path)
+
+class TransactionJournal:
+    """Snapshot file plus an append-only log of transaction changes.
+
+    Every add, edit or delete appends one small JSON line to the log instead
+    of rewriting the whole snapshot. Once the log holds `compact_after`
+    records the owner writes a fresh snapshot and the log is truncated.
+    """
+
+    def __init__(self, snapshot_path='transactions.json', log_path='transactions.journal',
+                 compact_after=1000, codec=None):
+        self.snapshot_path = snapshot_path
+        self.codec = codec or get_json_codec()
+        self.log_path = log_path
+        self.compact_after = compact_after
+        self.log_records = 0
+
+    @property
+    def needs_compaction(self):
+        return self.log_records >= self.compact_after
+
+    def load(self):
+        """Return transaction dicts from the snapshot with the log replayed on top"""
+        return list(self.iter_transactions())
+
+    def iter_transactions(self):
+        """Yield transaction dicts: the log's current versions first, then the
+        snapshot rows the log doesn't replace"""
+        if not os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'w') as f:
+                json.dump([], f)
+
+        # Last record for an id wins, None marks a deleted transaction
+        changes = self.read_log()
+        for t_dict in changes.values():
+            if t_dict is not None:
+                yield t_dict
+        for t_dict in self.iter_snapshot():
+            if t_dict['id'] not in changes:
+                yield t_dict
+
+    def iter_snapshot(self):
+        """Yield the snapshot's transaction dicts one at a time.
+
+        Snapshots are written as a JSON array with one transaction per line,
+        which is parsed a thousand lines at a time. Files in any other layout
+        are parsed as a whole.
+        """
+        with open(self.snapshot_path, 'rb') as f:
+            first, second = f.readline(), f.readline()
+            if first.rstrip() == b'[' and second[:1] in (b'{', b']', b'\r', b'\n'):
+                lines = chain([second], f)
+                rows = 0
+                while True:
+                    batch = list(islice(lines, 1000))
+                    if not batch:
+                        return
+                    try:
+                        chunk = self.parse_snapshot_lines(batch)
+                    except ValueError:
+                        if rows:
+                            raise
+                        # Rows spanning several lines, e.g. an indented file
+                        break
+                    rows += len(chunk)
+                    yield from chunk
+
+            f.seek(0)
+            data = self.codec.loads(f.read())
+            if isinstance(data, dict):
+                data = data.get('transactions', [])
+            yield from data
+
+    def parse_snapshot_lines(self, lines):
+        """Transaction dicts from snapshot lines holding one complete row each"""
+        rows = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line == b']':
+                continue
+            if not line.startswith(b'{') or not line.endswith((b'}', b'},')):
+                raise ValueError("Snapshot row spans several lines")
+            rows.append(line.rstrip(b','))
+        return self.codec.loads(b'[' + b','.join(rows) + b']')
+
+    def read_log(self):
+        changes = {}
+        self.log_records = 0
+        if not os.path.exists(self.log_path):
+            return changes
+
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = self.codec.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write
+                    continue
+                self.log_records += 1
+                if record['op'] == 'delete':
+                    changes[record['id']] = None
+                else:
+                    changes[record['id']] = record['transaction']
+        return changes
+
+    def append(self, records):
+        """Append (op, id, transaction dict) records to the log in one write.
+
+        op is 'add', 'update' or 'delete'; deletes carry no dict.
+        """
+        lines = []
+        for op, transaction_id, t_dict in records:
+            record = {'op': op, 'id': transaction_id}
+            if op != 'delete':
+                record['transaction'] = t_dict
+            lines.append(self.codec.dumps(record) + b'\n')
+        with open(self.log_path, 'a+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    # End a torn last line so the new records start on their own
+                    lines.insert(0, b'\n')
+            f.write(b''.join(lines))
+        self.log_records += len(lines)
+
+    def write_snapshot(self, data):
+        """Write a full snapshot and truncate the log it supersedes.
+
+        Transactions are best passed newest first, which lets the app show
+        the latest ones before the rest of the file is read.
+        """
+        temp_path = self.snapshot_path + '.tmp'
+        dumps = self.codec.dumps
+        with open(temp_path, 'wb') as f:
+            f.write(b'[\n')
+            f.write(b',\n'.join(dumps(t_dict) for t_dict in data))
+            f.write(b'\n]\n')
+        os.replace(temp_path, self.snapshot_path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self.log_records = 0
+
+class JsonStorage:
+    """Default storage: journaled transactions plus flat JSON files for budgets and goals"""
+
+    def __init__(self, budgets_path='budgets.json', savings_goals_path='savings_goals.json', codec=None):
+        self.codec = codec or get_json_codec()
+        self.journal = TransactionJournal(codec=self.codec)
+        self.budgets_path = budgets_path
+        self.savings_goals_path = savings_goals_path
+
+    @property
+    def needs_compaction(self):
+        return self.journal.needs_compaction
+
+    def load_transactions(self):
+        return self.journal.load()
+
+    def iter_transactions(self):
+        return self.journal.iter_transactions()
+
+    def record_transactions(self, records):
+        self.journal.append(records)
+
+    def save_transactions(self, transactions):
+        """Replace all transactions with a list of transaction dicts"""
+        self.journal.write_snapshot(transactions)
+
+    def load_budgets(self):
+        if os.path.exists(self.budgets_path):
+            with open(self.budgets_path, 'rb') as f:
+                return self.codec.loads(f.read())
+        return {}
+
+    def save_budgets(self, budgets):
+        write_json_atomic(self.budgets_path, budgets, self.codec)
+
+    def load_savings_goals(self):
+        if os.path.exists(self.savings_goals_path):
+            with open(self.savings_goals_path, 'rb') as f:
+                return self.codec.loads(f.read())
+        return {}
+
+    def save_savings_goals(self, savings_goals):
+        write_json_atomic(self.savings_goals_path, savings_goals, self.codec)
+
+    def savings_goals_version(self):
+        """Changes whenever the goals file is rewritten, by this app or another"""
+        try:
+            stat = os.stat(self.savings_goals_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+class SQLiteStorage:
+    """Optional storage in a single SQLite database with indexed transactions"""
+
+    needs_compaction = False
+
+    def __init__(self, path=SQLITE_DB_PATH):
+        self.path = path
+        # Saves run on the write-behind thread, reads on the Tk thread
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                id TEXT PRIMARY KEY,
+                amount REAL NOT NULL,
+                type TEXT NOT NULL,
+                category TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                date TEXT NOT NULL,
+                currency TEXT NOT NULL DEFAULT 'CZK'
+            );
+            CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+            CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category, type, date);
+            CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions (type, currency);
+            CREATE TABLE IF NOT EXISTS budgets (
+                category TEXT PRIMARY KEY,
+                amount REAL NOT NULL,
+                period TEXT NOT NULL,
+                currency TEXT
+            );
+            CREATE TABLE IF NOT EXISTS savings_goals (
+                name TEXT PRIMARY KEY,
+                target REAL NOT NULL,
+                current REAL NOT NULL,
+                monthly REAL NOT NULL,
+                deadline TEXT NOT NULL,
+                currency TEXT
+            );
+            CREATE TABLE IF NOT EXISTS savings_contributions (
+                goal TEXT NOT NULL REFERENCES savings_goals (name),
+                amount REAL NOT NULL,
+                date TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_contributions_goal ON savings_contributions (goal);
+        """)
+
+    def load_transactions(self):
+        return list(self.iter_transactions())
+
+    def iter_transactions(self):
+        """Yield transaction dicts, newest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, amount, type, category, description, date, currency FROM transactions "
+                "ORDER BY date DESC"
+            ).fetchall()
+        for row in rows:
+            yield {
+                'id': row[0],
+                'amount': row[1],
+                'type': row[2],
+                'category': row[3],
+                'description': row[4],
+                'date': row[5],
+                'currency': row[6]
+            }
+
+    def record_transactions(self, records):
+        """Apply (op, id, transaction dict) records in one transaction"""
+        with self.lock, self.conn:
+            for op, transaction_id, t_dict in records:
+                if op == 'delete':
+                    self.conn.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        self._transaction_row(t_dict)
+                    )
+
+    def save_transactions(self, transactions):
+        """Replace all transactions with a list of transaction dicts"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM transactions")
+            self.conn.executemany(
+                "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._transaction_row(t) for t in transactions)
+            )
+
+    @staticmethod
+    def _transaction_row(t):
+        return (t['id'], t['amount'], t['type'], t.get('category') or '', t.get('description') or '',
+                t['date'], t.get('currency', 'CZK'))
+
+    def load_budgets(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT category, amount, period, currency FROM budgets").fetchall()
+        return {
+            category: {'amount': amount, 'period': period, 'currency': currency}
+            for category, amount, period, currency in rows
+        }
+
+    def save_budgets(self, budgets):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM budgets")
+            self.conn.executemany(
+                "INSERT INTO budgets VALUES (?, ?, ?, ?)",
+                (
+                    (category, budget['amount'], budget['period'], budget.get('currency'))
+                    for category, budget in budgets.items()
+                )
+            )
+
+    def load_savings_goals(self):
+        with self.lock:
+            goals = self.conn.execute(
+                "SELECT name, target, current, monthly, deadline, currency FROM savings_goals"
+            ).fetchall()
+            contributions = self.conn.execute(
+                "SELECT goal, amount, date FROM savings_contributions ORDER BY rowid"
+            ).fetchall()
+        savings_goals = {}
+        for name, target, current, monthly, deadline, currency in goals:
+            savings_goals[name] = {
+                'target': target,
+                'current': current,
+                'monthly': monthly,
+                'deadline': deadline,
+                'contributions': [],
+                'currency': currency
+            }
+        for goal, amount, date in contributions:
+            if goal in savings_goals:
+                savings_goals[goal]['contributions'].append({'amount': amount, 'date': date})
+        return savings_goals
+
+    def save_savings_goals(self, savings_goals):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM savings_contributions")
+            self.conn.execute("DELETE FROM savings_goals")
+            for name, goal in savings_goals.items():
+                self.conn.execute(
+                    "INSERT INTO savings_goals VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, goal['target'], goal['current'], goal['monthly'],
+                     goal['deadline'], goal.get('currency'))
+                )
+                self.conn.executemany(
+                    "INSERT INTO savings_contributions VALUES (?, ?, ?)",
+                    ((name, c['amount'], c['date']) for c in goal['contributions'])
+                )
+
+    def savings_goals_version(self):
+        """Changes when another connection commits to the database"""
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+def create_storage():
+    """Use the SQLite database once it has been created by the migrator, JSON files otherwise"""
+    if os.path.exists(SQLITE_DB_PATH):
+        return SQLiteStorage()
+    return JsonStorage()
+
+def migrate_json_to_sqlite(db_path=SQLITE_DB_PATH):
+    """One-shot copy of the JSON data files into a new SQLite database"""
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+
+    source = JsonStorage()
+    transactions = []
+    seen_ids = set()
+    for t_dict in source.load_transactions():
+        t = Transaction.from_dict(t_dict)
+        if t.id in seen_ids:
+            t.id = Transaction.new_id()
+        seen_ids.add(t.id)
+        transactions.append(t)
+
+    target = SQLiteStorage(db_path)
+    try:
+        target.save_transactions([t.to_dict() for t in transactions])
+        target.save_budgets(source.load_budgets())
+        target.save_savings_goals(source.load_savings_goals())
+    except Exception:
+        target.conn.close()
+        os.remove(db_path)
+        raise
+    target.conn.close()
+    return len(transactions)
+
+class WriteBehindPersister:
+    """Saves data on a background thread once edits have paused.
+
+    Work is queued per store: `save` replaces everything queued for a store
+    with one full write, `add` queues a record that is written together with
+    the store's other queued records by a single write_records(records)
+    call. Queued work runs once nothing new has arrived for `delay` seconds,
+    and `flush` writes whatever is left on the calling thread. Background
+    failures are passed to `on_error` on the writer thread, once per run of
+    failed retries.
+    """
+
+    def __init__(self, delay=WRITE_BEHIND_DELAY, on_error=None):
+        self.delay = delay
+        self.on_error = on_error
+        self.failing = False
+        # store -> [full write or None, write_records, records]
+        self.pending = {}
+        self.writing = set()
+        self.ready_at = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def save(self, store, write):
+        with self.condition:
+            self.pending[store] = [write, None, []]
+            self._changed()
+
+    def add(self, store, record, write_records):
+        with self.condition:
+            entry = self.pending.setdefault(store, [None, write_records, []])
+            entry[1] = write_records
+            entry[2].append(record)
+            self._changed()
+
+    def busy(self, store):
+        """Whether writes for a store are queued or running"""
+        with self.condition:
+            return store in self.pending or store in self.writing
+
+    def flush(self):
+        """Write everything queued now and wait for it, e.g. before quitting"""
+        with self.condition:
+            while self.writing:
+                self.condition.wait()
+            pending = self._take()
+        self._write(pending)
+
+    def _changed(self):
+        self.ready_at = time.monotonic() + self.delay
+        self.condition.notify_all()
+
+    def _take(self):
+        pending, self.pending = self.pending, {}
+        self.writing = set(pending)
+        return pending
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending or time.monotonic() < self.ready_at:
+                    timeout = self.ready_at - time.monotonic() if self.pending else None
+                    self.condition.wait(timeout)
+                pending = self._take()
+            try:
+                self._write(pending)
+            except Exception as e:
+                if self.failing:
+                    continue
+                self.failing = True
+                if self.on_error is None:
+                    print(f"Failed to save data: {e}")
+                    continue
+                try:
+                    self.on_error(e)
+                except Exception:
+                    # Reporting must not stop the writer, later saves still run
+                    print(f"Failed to save data: {e}")
+            else:
+                self.failing = False
+
+    def _write(self, pending):
+        try:
+            for store in list(pending):
+                write, write_records, records = pending[store]
+                if write is not None:
+                    write()
+                if records:
+                    write_records(records)
+                del pending[store]
+        except Exception:
+            with self.condition:
+                # Put back what wasn't written, ahead of anything newer
+                for store, (write, write_records, records) in pending.items():
+                    newer = self.pending.get(store)
+                    if newer is None:
+                        self.pending[store] = [write, write_records, records]
+                    elif newer[0] is None:
+                        newer[0] = write
+                        newer[2][:0] = records
+                self.ready_at = time.monotonic() + WRITE_BEHIND_RETRY
+            raise
+        finally:
+            with self.condition:
+                self.writing = set()
+                self.condition.notify_all()
+
+class ExportCancelled(Exception):
+    """Raised inside a report build when the user cancels the export"""
+
+class PdfReport:
+    """A PDF report built from a snapshot of the ledger.
+
+    Everything is copied when the report is created, so `build` can run on a
+    worker thread while the user keeps editing. Charts are either 300 dpi
+    matplotlib rasters or, with `vector_charts`, native ReportLab drawings.
+    """
+
+    def __init__(self, store, analytics, currency, converter,
+                 vector_charts=False, date_range=None, monthly_summary=False):
+        self.store = store
+        # Summary, table and charts all use the analytics amounts, converted
+        # at the rate of each transaction's date, so their totals agree
+        self.analytics = analytics
+        self.amounts = analytics.amounts
+        self.currency = currency
+        self.currency_symbol = converter.currencies[currency]
+        self.format_amount = converter.format_amount
+        self.vector_charts = vector_charts
+        # Optional (first, last) ISO dates limiting the table
+        self.date_range = date_range
+        # Table of monthly totals instead of every transaction
+        self.monthly_summary = monthly_summary
+        self.cancelled = threading.Event()
+        self.progress = None
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def report_progress(self, fraction, message):
+        if self.cancelled.is_set():
+            raise ExportCancelled()
+        if self.progress is not None:
+            self.progress(fraction, message)
+
+    def build(self, file_path, progress=None):
+        """Write the report, calling progress(fraction, message) as it goes"""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import (
+            SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, KeepTogether
+        )
+
+        self.progress = progress
+
+        # Get current date and time for the report
+        formatted_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Create the PDF document
+        doc = SimpleDocTemplate(
+            file_path,
+            pagesize=letter,
+            rightMargin=36,
+            leftMargin=36,
+            topMargin=36,
+            bottomMargin=36
+        )
+
+        elements = []
+
+        # Add title and date
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            fontName='Helvetica-Bold'
+        )
+
+        # Define summary style
+        summary_style = ParagraphStyle(
+            'Summary',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=12,
+            fontName='Helvetica'
+        )
+
+        elements.append(Paragraph("Budget Report", title_style))
+
+        date_style = ParagraphStyle(
+            'DateStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.grey,
+            spaceAfter=20,
+            fontName='Helvetica'
+        )
+        elements.append(Paragraph(f"Generated on: {formatted_datetime}", date_style))
+        elements.append(Spacer(1, 20))
+
+        # Function to create a KeepTogether block for graph and its title
+        def add_graph_section(title, chart):
+            graph_section = []
+            graph_section.append(Paragraph(title, styles['Heading2']))
+            graph_section.append(Spacer(1, 12))
+            graph_section.append(chart)
+            elements.append(KeepTogether(graph_section))
+            elements.append(Spacer(1, 20))
+
+        currency_symbol = self.currency_symbol
+
+        total_income, total_expenses = self.analytics.income_and_expenses()
+        balance = total_income - total_expenses
+
+        elements.append(Paragraph(f"Balance: {currency_symbol}{balance:.2f}", summary_style))
+        elements.append(Paragraph(f"Total Income: {currency_symbol}{total_income:.2f}", summary_style))
+        elements.append(Paragraph(f"Total Expenses: {currency_symbol}{total_expenses:.2f}", summary_style))
+        elements.append(Paragraph(
+            "All amounts in this report are converted at the exchange rate of each transaction's date.",
+            styles['Italic']
+        ))
+        elements.append(Spacer(1, 20))
+
+        # Raster charts render in other processes while the table is prepared here
+        charts = [] if self.vector_charts else self.submit_charts()
+        try:
+            # Add transaction table first
+            start, end = self.row_range()
+            heading = "Monthly Summary" if self.monthly_summary else "Transaction History"
+            if self.date_range is not None:
+                heading += f" ({self.date_range[0]} to {self.date_range[1]})"
+            elements.append(Paragraph(heading, styles['Heading2']))
+            elements.append(Spacer(1, 12))
+
+            # Adjust column widths proportionally
+            available_width = letter[0] - doc.leftMargin - doc.rightMargin
+            if self.monthly_summary:
+                header = ['Month', 'Transactions', 'Income', 'Expenses', 'Net']
+                col_widths = [available_width * 0.2] * 5
+                rows = self.monthly_rows(start, end)
+            else:
+                header = ['Date', 'Type', 'Category', 'Description', 'Amount']
+                col_widths = [
+                    available_width * 0.15,  # Date
+                    available_width * 0.15,  # Type
+                    available_width * 0.2,   # Category
+                    available_width * 0.35,  # Description
+                    available_width * 0.15   # Amount
+                ]
+                rows = self.table_rows(start, end, styles['Normal'], col_widths[3])
+
+            # Update table style for better formatting
+            table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),  # Amount column right-aligned
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 4),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('BOX', (0, 0), (-1, -1), 1, colors.black),
+                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
+                # Alternating row colors, one command for all rows
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.beige]),
+            ])
+
+            # One table per chunk, so rows are laid out a chunk at a time
+            # instead of as a single huge table. Chunks have an even number
+            # of rows, which keeps the row colors alternating across them.
+            for chunk in range(0, max(len(rows), 1), TABLE_CHUNK_ROWS):
+                table = Table([header] + rows[chunk:chunk + TABLE_CHUNK_ROWS], colWidths=col_widths, repeatRows=1)
+                table.setStyle(table_style)
+                elements.append(table)
+            elements.append(Spacer(1, 30))
+
+            # Wait for the charts, still answering to cancel
+            pending = {future for _, future, _, _ in charts}
+            while pending:
+                self.report_progress(0.3 + 0.2 * (len(charts) - len(pending)) / len(charts), "Rendering charts...")
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+
+            # Add graphs with their titles
+            if self.vector_charts:
+                for title, drawing in self.chart_drawings():
+                    add_graph_section(title, drawing)
+            for title, future, width, height in charts:
+                add_graph_section(title, Image(BytesIO(future.result()), width=width, height=height))
+
+            # Generate PDF, flowables are laid out one at a time
+            self.report_progress(0.5, "Laying out pages...")
+            size = [len(elements)]
+
+            def on_build_progress(typ, value):
+                if typ == 'SIZE_EST':
+                    size[0] = max(value, 1)
+                elif typ == 'PROGRESS':
+                    self.report_progress(0.5 + 0.5 * min(value / size[0], 1), "Laying out pages...")
+
+            doc.setProgressCallBack(on_build_progress)
+            doc.build(elements)
+        except BrokenProcessPool:
+            # A renderer process died, start a fresh pool next time
+            drop_chart_pool()
+            raise
+        finally:
+            for _, future, _, _ in charts:
+                future.cancel()
+
+    def row_range(self):
+        """Store rows inside the report's date range, the store is in date order"""
+        if self.date_range is None:
+            return 0, len(self.store)
+        first, last = (date.fromisoformat(day).toordinal() for day in self.date_range)
+        return bisect_left(self.store.ordinals, first), bisect_right(self.store.ordinals, last)
+
+    def table_rows(self, start, end, description_style, description_width):
+        """Rows of the transaction table, newest transactions first"""
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.platypus import Paragraph
+
+        store = self.store
+        rows = []
+        total = max(end - start, 1)
+        for count, index in enumerate(range(end - 1, start - 1, -1)):
+            if count % 1000 == 0:
+                self.report_progress(0.3 * count / total, "Preparing transactions...")
+            currency = store.currencies[store.currency_codes[index]]
+
+            # Format amount with currency symbol
+            amount_str = self.format_amount(float(self.amounts[index]), self.currency)
+
+            # Add original amount if different currency
+            if (currency != self.currency and
+                self.currency == 'CZK' and
+                currency in ['EUR', 'USD']):
+                original_amount = self.format_amount(store.amounts[index], currency)
+                amount_str = f"{amount_str} ({original_amount})"
+
+            # Only descriptions too wide for their column need a wrapping Paragraph
+            description = store.descriptions[index]
+            if pdfmetrics.stringWidth(description, 'Helvetica', 10) > description_width - 8:
+                description = Paragraph(escape(description), description_style)
+
+            rows.append([
+                date.fromordinal(store.ordinals[index]).isoformat(),
+                store.types[store.type_codes[index]],
+                store.categories[store.category_codes[index]],
+                description,
+                amount_str
+            ])
+        return rows
+
+    def monthly_rows(self, start, end):
+        """Rows of income, expenses and net per month, newest month first"""
+        self.report_progress(0.0, "Summarizing months...")
+        days = np.array(self.store.ordinals[start:end], dtype=np.int64) - EPOCH_ORDINAL
+        months, month_index = np.unique(days.astype('datetime64[D]').astype('datetime64[M]'), return_inverse=True)
+        amounts = np.asarray(self.amounts, dtype=float)[start:end]
+        income = np.bincount(month_index, weights=amounts * self.analytics.is_income[start:end], minlength=len(months))
+        expenses = np.bincount(month_index, weights=amounts * self.analytics.is_expense[start:end], minlength=len(months))
+        counts = np.bincount(month_index, minlength=len(months))
+        return [
+            [
+                str(months[i]),
+                str(counts[i]),
+                self.format_amount(float(income[i]), self.currency),
+                self.format_amount(float(expenses[i]), self.currency),
+                self.format_amount(float(income[i] - expenses[i]), self.currency)
+            ]
+            for i in range(len(months) - 1, -1, -1)
+        ]
+
+    def submit_charts(self):
+        """Start rendering the charts to PNG bytes, as (title, future, width, height)"""
+        from reportlab.lib.units import inch
+
+        pool = get_chart_pool()
+        dates, balances = self.balance_points()
+        symbol = self.currency_symbol
+        return [
+            ("Balance History",
+             pool.submit(render_balance_chart, dates, balances, symbol),
+             7*inch, 3.5*inch),
+            ("Income vs Expenses",
+             pool.submit(render_expense_chart, *self.analytics.income_and_expenses(), symbol),
+             6*inch, 4.5*inch),
+            ("Expense Categories",
+             pool.submit(render_category_chart, dict(self.analytics.category_expenses()), symbol),
+             6*inch, 6*inch),
+        ]
+
+    def chart_drawings(self):
+        """The charts as ReportLab drawings, as (title, drawing)"""
+        from reportlab.lib.units import inch
+
+        symbol = self.currency_symbol
+        return [
+            ("Balance History", balance_drawing(*self.balance_points(), symbol, 7*inch, 3.5*inch)),
+            ("Income vs Expenses",
+             expense_drawing(*self.analytics.income_and_expenses(), symbol, 6*inch, 4.5*inch)),
+            ("Expense Categories",
+             category_drawing(self.analytics.category_expenses(), symbol, 6*inch, 6*inch)),
+        ]
+
+    def balance_points(self):
+        """Balance history, thinned out for large ledgers"""
+        dates, balances = self.analytics.balance_history()
+        return downsample_series(dates, balances, CHART_MAX_POINTS)
+
+def downsample_series(x, y, max_points):
+    """At most about max_points of a series, keeping each bucket's low and high.
+
+    A chart can't show more points than it is wide, but plotting only every
+    n-th point would hide spikes; the minimum and maximum of every bucket
+    keep the outline of the curve.
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    buckets = max(1, max_points // 2)
+    size = -(-n // buckets)
+    # Pad with the last value so the series splits into equal buckets
+    padded = np.concatenate([y, np.full(buckets * size - n, y[-1])]).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate([
+        [0, n - 1],
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+    ])
+    keep = np.unique(np.minimum(keep, n - 1))
+    return x[keep], y[keep]
+
+def chart_title(drawing, title):
+    from reportlab.graphics.shapes import String
+
+    drawing.add(String(drawing.width / 2, drawing.height - 14, title,
+                       textAnchor='middle', fontName='Helvetica-Bold', fontSize=12))
+
+def balance_drawing(dates, balances, currency_symbol, width, height):
+    """Balance over time"""
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    drawing = Drawing(width, height)
+    if len(dates):
+        days = dates.astype(np.int64)
+        plot = LinePlot()
+        plot.x, plot.y = 60, 55
+        plot.width, plot.height = width - 80, height - 85
+        plot.data = [list(zip(days.tolist(), balances.tolist()))]
+        plot.lines[0].strokeColor = colors.blue
+        plot.lines[0].strokeWidth = 1
+        plot.xValueAxis.valueMin = int(days[0])
+        plot.xValueAxis.valueMax = int(days[-1]) + 1
+        plot.xValueAxis.labelTextFormat = lambda day: str(np.datetime64(int(day), 'D'))
+        plot.xValueAxis.labels.angle = 45
+        plot.xValueAxis.labels.boxAnchor = 'ne'
+        plot.xValueAxis.labels.fontName = 'Helvetica'
+        plot.xValueAxis.labels.fontSize = 7
+        plot.yValueAxis.labelTextFormat = lambda x: f'{currency_symbol}{x:,.0f}'
+        plot.yValueAxis.labels.fontName = 'Helvetica'
+        plot.yValueAxis.labels.fontSize = 7
+        drawing.add(plot)
+        chart_title(drawing, 'Balance Over Time')
+    return drawing
+
+def expense_drawing(income, expenses, currency_symbol, width, height):
+    """Income vs expenses"""
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    drawing = Drawing(width, height)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 70, 30
+    chart.width, chart.height = width - 90, height - 60
+    chart.data = [(income, expenses)]
+    chart.categoryAxis.categoryNames = ['Income', 'Expenses']
+    chart.bars[(0, 0)].fillColor = colors.green
+    chart.bars[(0, 1)].fillColor = colors.red
+    chart.barSpacing = 20
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labelTextFormat = lambda x: f'{currency_symbol}{x:,.0f}'
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    drawing.add(chart)
+    chart_title(drawing, 'Income vs Expenses')
+    return drawing
+
+def category_drawing(category_expenses, currency_symbol, width, height):
+    """Expenses by category"""
+    from reportlab.graphics.charts.piecharts import Pie
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    drawing = Drawing(width, height)
+    if category_expenses:
+        sorted_data = sorted(category_expenses.items(), key=lambda x: x[1], reverse=True)
+        total = sum(amount for _, amount in sorted_data)
+        pie = Pie()
+        size = min(width, height) - 160
+        pie.x, pie.y = (width - size) / 2, (height - size) / 2 - 10
+        pie.width = pie.height = size
+        pie.data = [amount for _, amount in sorted_data]
+        pie.labels = [
+            f'{cat} ({currency_symbol}{amt:.2f}, {amt / total * 100:.1f}%)' if total else cat
+            for cat, amt in sorted_data
+        ]
+        pie.startAngle = 90
+        pie.direction = 'clockwise'
+        pie.sideLabels = True
+        pie.slices.fontName = 'Helvetica'
+        pie.slices.fontSize = 8
+        pie.slices.strokeColor = colors.white
+        drawing.add(pie)
+        chart_title(drawing, 'Expenses by Category')
+    return drawing
+
+# PDF charts render in worker processes, so the renderers are plain
+# functions of picklable data and use matplotlib's object-oriented API
+_chart_pool = None
+
+def get_chart_pool():
+    """Process pool for chart rendering, started on first export and reused"""
+    global _chart_pool
+    if _chart_pool is None:
+        # Spawned, not forked: the parent holds Tk and other threads
+        _chart_pool = ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context('spawn'))
+    return _chart_pool
+
+def drop_chart_pool():
+    global _chart_pool
+    if _chart_pool is not None:
+        _chart_pool.shutdown(wait=False, cancel_futures=True)
+        _chart_pool = None
+
+def figure_png(fig, **kwargs):
+    """PNG bytes of a figure, rendered in memory"""
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=300, **kwargs)
+    return buffer.getvalue()
+
+def currency_axis_formatter(currency_symbol):
+    from matplotlib.ticker import FuncFormatter
+
+    return FuncFormatter(lambda x, p: f'{currency_symbol}{x:,.0f}')
+
+def render_balance_chart(dates, balances, currency_symbol):
+    """Balance over time"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 5))
+    if len(dates):
+        ax = fig.add_subplot(111)
+        ax.plot(dates, balances, 'b-')
+        ax.set_title('Balance Over Time')
+        ax.set_xlabel('Date')
+        ax.set_ylabel(f'Balance ({currency_symbol})')
+        ax.tick_params(axis='x', labelrotation=45)
+
+        # Format y-axis with currency symbol
+        ax.yaxis.set_major_formatter(currency_axis_formatter(currency_symbol))
+        fig.tight_layout(pad=1.5)
+    return figure_png(fig)
+
+def render_expense_chart(income, expenses, currency_symbol):
+    """Income vs expenses"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot(111)
+    ax.bar(['Income', 'Expenses'], [income, expenses], color=['g', 'r'], width=0.6)
+    ax.set_title('Income vs Expenses')
+    ax.set_ylabel(f'Amount ({currency_symbol})')
+
+    # Format y-axis with currency symbol
+    ax.yaxis.set_major_formatter(currency_axis_formatter(currency_symbol))
+    fig.tight_layout(pad=1.5)
+    return figure_png(fig)
+
+def render_category_chart(category_expenses, currency_symbol):
+    """Expenses by category"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 8))
+    if category_expenses:
+        ax = fig.add_subplot(111)
+        sorted_data = sorted(category_expenses.items(), key=lambda x: x[1], reverse=True)
+        categories, amounts = zip(*sorted_data)
+
+        # Create labels with converted amounts
+        labels = [f'{cat}\n({currency_symbol}{amt:.2f})' for cat, amt in zip(categories, amounts)]
+
+        ax.pie(amounts,
+               labels=labels,
+               autopct='%1.1f%%',
+               startangle=90,
+               counterclock=False,
+               pctdistance=0.85,
+               labeldistance=1.1)
+        ax.set_title('Expenses by Category')
+        ax.axis('equal')
+    return figure_png(fig, pad_inches=0.5)
+
 class BudgetTracker:
     def __init__(self, root):
         self.root = root
@@ -105,9 +1693,13 @@ class BudgetTracker:
         
         # Rest of initialization remains the same...
         self.transactions = []
+        self.totals = TransactionTotals()
+        self.spending_index = SpendingIndex()
+        # Columnar copy for analytics, built on first use and then kept in step
+        self.transaction_store = None
         self.selected_items = []
         self.editing = False
-        self.edit_index = None
+        self.edited_transaction = None
         self.custom_category_var = tk.StringVar()
         self.showing_graphs = False
         self.graphs_frame = None
@@ -116,12 +1708,24 @@ class BudgetTracker:
         
         # Initialize storage variables
         self.budgets = {}
+        # The in-memory goals are authoritative, storage is re-read only
+        # when its version shows that something else changed it
         self.savings_goals = {}
+        self.savings_goals_version = None
+        self.storage = create_storage()
+        # Saves are queued and written in the background, flushed on close
+        self.save_errors = queue.Queue()
+        self.persister = WriteBehindPersister(on_error=self.save_errors.put)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Older transactions keep loading after the window opens
+        self.transaction_loader = None
+        # Set while a full snapshot waits for the writer thread
+        self.compaction_queued = False
         
         # Load all data first
         self.load_budgets()
         self.load_transactions()
-        self.initialize_savings_goals()
+        self.load_savings_goals()
         
         # Then create all widgets
         self.create_widgets()
@@ -130,52 +1734,20 @@ class BudgetTracker:
         # Finally update display
         self.update_display()
 
-    def initialize_savings_goals(self):
-        """Initialize savings goals with fresh data from file"""
-        print("Initializing savings goals...")  # Debug print
-        self.savings_goals = {}  # Clear existing goals
-        
-        try:
-            if os.path.exists('savings_goals.json'):
-                print("Found savings_goals.json")  # Debug print
-                with open('savings_goals.json', 'r') as f:
-                    print("Current file contents:")  # Debug print
-                    content = f.read()
-                    print(content)  # Debug print
-                    f.seek(0)  # Reset file pointer
-                    
-                    data = json.load(f)
-                    print("Loaded goals:", data)  # Debug print
-                    
-                    # Verify each goal's data structure
-                    for name, goal in data.items():
-                        if all(key in goal for key in ['target', 'current', 'monthly', 'deadline', 'contributions']):
-                            self.savings_goals[name] = goal
-                            print(f"Added valid goal: {name}")  # Debug print
-                        else:
-                            print(f"Skipped invalid goal: {name}")  # Debug print
-                    
-                print("Final savings_goals:", self.savings_goals)  # Debug print
-                
-                # Force rewrite the file with only valid goals
-                self.save_savings_goals()
-                
-                # Verify the file was rewritten correctly
-                with open('savings_goals.json', 'r') as f:
-                    print("File contents after save:")  # Debug print
-                    print(f.read())  # Debug print
-                    
-            else:
-                print("No savings_goals.json found, creating new file")  # Debug print
-                self.save_savings_goals()
-                
-        except Exception as e:
-            print(f"Error in initialize_savings_goals: {str(e)}")  # Debug print
-            self.savings_goals = {}
-            self.save_savings_goals()
+        # Exchange rates arrive in the background and redraw the amounts
+        self.rate_updates = queue.Queue()
+        self.refresh_exchange_rates()
 
-        # Final verification
-        print("Final savings goals state:", self.savings_goals)  # Debug print
+        # Background save failures are shown from here
+        self.poll_save_errors()
+
+        # PDF reports are built on a worker thread that reports back here
+        self.export_report = None
+        self.export_updates = queue.Queue()
+        # Report options, kept for the session
+        self.vector_charts = tk.BooleanVar(value=False)
+        self.export_limit_dates = tk.BooleanVar(value=False)
+        self.export_monthly = tk.BooleanVar(value=False)
 
     def create_widgets(self):
         # Create Menu Bar
@@ -290,7 +1862,8 @@ class BudgetTracker:
         self.cancel_button.grid_remove()
 
         # Summary Frame
-        self.summary_frame = ttk.LabelFrame(self.root, text="Summary", padding="10")
+        # The summary and the charts convert at different rates, so each says which
+        self.summary_frame = ttk.LabelFrame(self.root, text="Summary (at today's rates)", padding="10")
         self.summary_frame.pack(fill="x", padx=10, pady=5)
 
         # Balance, Income, and Expenses labels in a separate frame
@@ -381,16 +1954,36 @@ class BudgetTracker:
         self.tree.column('amount', width=100)
 
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(self.transactions_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(self.transactions_frame, orient="vertical", command=self.on_tree_scroll)
+        self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
 
         # Pack the treeview and scrollbar
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.tree_scrollbar.pack(side="right", fill="y")
+
+        # Virtual list state, used once the ledger exceeds VIRTUAL_LIST_THRESHOLD
+        self.virtual_mode = False
+        self.virtual_offset = 0
+        self.virtual_row_cache = {}
+        self.tree_row_height = None
+        self.tree_heading_height = 0
+
+        # Outside virtual mode each transaction keeps its own tree item
+        self.tree_items = {}  # Transaction.id -> tree item id
+        self.item_transactions = {}  # tree item id -> Transaction
+        self.tree_values = {}  # Transaction.id -> displayed values
 
         # Bind right-click event and selection event
         self.tree.bind("<Button-3>", self.show_context_menu)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
+
+        # Viewport changes refill the virtual rows
+        self.tree.bind("<Configure>", self.on_tree_resize)
+        self.tree.bind("<MouseWheel>", self.on_tree_mousewheel)
+        self.tree.bind("<Button-4>", self.on_tree_mousewheel)
+        self.tree.bind("<Button-5>", self.on_tree_mousewheel)
+        for key in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(key, self.on_tree_key)
         
         # Create context menus
         self.single_item_menu = tk.Menu(self.root, tearoff=0)
@@ -401,10 +1994,22 @@ class BudgetTracker:
         self.multi_item_menu.add_command(label="Delete Selected", command=self.delete_transactions)
 
     def create_graphs_frame(self):
-        self.graphs_frame = ttk.LabelFrame(self.main_container, text="Analytics", padding="10")
-        
+        self.graphs_frame = ttk.LabelFrame(
+            self.main_container,
+            text="Analytics (at the rate of each transaction's date)",
+            padding="10"
+        )
+        # The figure is created the first time analytics is shown
+        self.fig = None
+        self.graph_update_pending = False
+
+    def create_graphs_figure(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import FuncFormatter
+
         # Create figure with subplots
-        self.fig = plt.Figure(figsize=(12, 6), dpi=100)
+        self.fig = Figure(figsize=(12, 6), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graphs_frame)
         
         # Create frame for the canvas
@@ -414,403 +2019,276 @@ class BudgetTracker:
         # Pack the canvas
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
-    def update_graphs(self):
-        self.fig.clear()
-        
-        # Create three subplots
-        balance_ax = self.fig.add_subplot(131)
-        expense_ax = self.fig.add_subplot(132)
-        category_ax = self.fig.add_subplot(133)
-
-        # Get currency symbol for labels
-        currency_symbol = self.currency_converter.currencies[self.preferred_currency.get()]
+        # Axes and artists are created once and only get new data on updates
+        self.balance_ax = self.fig.add_subplot(131)
+        self.expense_ax = self.fig.add_subplot(132)
+        self.category_ax = self.fig.add_subplot(133)
+        self.balance_line = None
+        # Categories in wedge order, with the wedges and their texts
+        self.pie_categories = None
+        self.pie_wedges = self.pie_labels = self.pie_percents = []
+        self.graph_currency = None
 
-        # Balance over time
-        dates = []
-        balances = []
-        running_balance = 0
-        
-        # Sort transactions by date
-        sorted_transactions = sorted(self.transactions, key=lambda x: x.date)
-        
-        for t in sorted_transactions:
-            dates.append(datetime.strptime(t.date, "%Y-%m-%d"))
-            # Convert amount to preferred currency
-            converted_amount = self.currency_converter.convert_amount(
-                t.amount,
-                t.currency,
-                self.preferred_currency.get()
-            )
-            if t.type == 'income':
-                running_balance += converted_amount
-            else:
-                running_balance -= converted_amount
-            balances.append(running_balance)
+        self.balance_ax.set_title('Balance Over Time')
+        self.balance_ax.set_xlabel('Date')
+        self.balance_ax.tick_params(axis='x', rotation=45)
 
-        if dates:  # Only plot if there are transactions
-            balance_ax.plot(dates, balances, 'b-')
-            balance_ax.set_title('Balance Over Time')
-            balance_ax.set_xlabel('Date')
-            balance_ax.set_ylabel(f'Balance ({currency_symbol})')
-            balance_ax.tick_params(axis='x', rotation=45)
-
-        # Income vs Expenses
-        income = sum(
-            self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-            for t in self.transactions if t.type == 'income'
-        )
-        expenses = sum(
-            self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-            for t in self.transactions if t.type == 'expense'
-        )
-        
-        expense_ax.bar(['Income', 'Expenses'], [income, expenses], color=['g', 'r'])
-        expense_ax.set_title('Income vs Expenses')
-        expense_ax.set_ylabel(f'Amount ({currency_symbol})')
+        self.expense_bars = self.expense_ax.bar(['Income', 'Expenses'], [0, 0], color=['g', 'r'])
+        self.expense_ax.set_title('Income vs Expenses')
 
         # Format y-axis labels with currency symbol for both graphs
         def format_amount(x, p):
-            return f'{currency_symbol}{x:,.0f}'
-        
-        balance_ax.yaxis.set_major_formatter(plt.FuncFormatter(format_amount))
-        expense_ax.yaxis.set_major_formatter(plt.FuncFormatter(format_amount))
-
-        # Expenses by category
-        category_expenses = defaultdict(float)
-        for t in self.transactions:
-            if t.type == 'expense':
-                # Convert amount to preferred currency
-                converted_amount = self.currency_converter.convert_amount(
-                    t.amount,
-                    t.currency,
-                    self.preferred_currency.get()
-                )
-                category_expenses[t.category or 'Uncategorized'] += converted_amount
-
-        if category_expenses:  # Only plot if there are expenses
-            categories = list(category_expenses.keys())
-            amounts = list(category_expenses.values())
-            
-            # Sort by amount for better visualization
-            sorted_data = sorted(zip(categories, amounts), key=lambda x: x[1], reverse=True)
-            categories, amounts = zip(*sorted_data)
-            
-            # Create custom labels with amounts
-            total = sum(amounts)
-            labels = [f'{cat}\n({currency_symbol}{amt:.2f})' for cat, amt in zip(categories, amounts)]
-            
-            category_ax.pie(amounts, labels=labels, autopct='%1.1f%%')
-            category_ax.set_title('Expenses by Category')
-
-        # Adjust layout and display
-        self.fig.tight_layout()
-        self.canvas.draw()
-
-    def export_pdf(self):
-        try:
-            # Get current date and time for filename and report
-            export_date = datetime.now()
-            formatted_date = export_date.strftime("%Y-%m-%d")
-            formatted_datetime = export_date.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Create default filename with date
-            default_filename = f"Balance Report of {formatted_date}.pdf"
-            
-            # Ask user where to save the PDF
-            file_path = filedialog.asksaveasfilename(
-                initialfile=default_filename,
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save PDF Report"
-            )
-            
-            if not file_path:  # If user cancels the dialog
-                return
+            return f'{self.currency_converter.currencies[self.graph_currency]}{x:,.0f}'
 
-            # Create the PDF document
-            doc = SimpleDocTemplate(
-                file_path,
-                pagesize=letter,
-                rightMargin=36,
-                leftMargin=36,
-                topMargin=36,
-                bottomMargin=36
-            )
+        self.balance_ax.yaxis.set_major_formatter(FuncFormatter(format_amount))
+        self.expense_ax.yaxis.set_major_formatter(FuncFormatter(format_amount))
 
-            elements = []
-
-            # Add title and date
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                fontName='Helvetica-Bold'
-            )
-            
-            # Define summary style
-            summary_style = ParagraphStyle(
-                'Summary',
-                parent=styles['Normal'],
-                fontSize=12,
-                spaceAfter=12,
-                fontName='Helvetica'
-            )
-
-            elements.append(Paragraph("Budget Report", title_style))
-            
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                textColor=colors.grey,
-                spaceAfter=20,
-                fontName='Helvetica'
-            )
-            elements.append(Paragraph(f"Generated on: {formatted_datetime}", date_style))
-            elements.append(Spacer(1, 20))
-
-            # Function to create a KeepTogether block for graph and its title
-            def add_graph_section(title, image_path, width, height):
-                if os.path.exists(image_path):
-                    graph_section = []
-                    graph_section.append(Paragraph(title, styles['Heading2']))
-                    graph_section.append(Spacer(1, 12))
-                    graph_section.append(Image(image_path, width=width, height=height))
-                    elements.append(KeepTogether(graph_section))
-                    elements.append(Spacer(1, 20))
-
-            # Get currency symbol for formatting
-            currency_symbol = self.currency_converter.currencies[self.preferred_currency.get()]
+    def update_graphs(self):
+        # Bursts of updates (e.g. several edits in one event) draw once
+        if not self.graph_update_pending:
+            self.graph_update_pending = True
+            self.root.after_idle(self.redraw_graphs)
+
+    def redraw_graphs(self):
+        self.graph_update_pending = False
+        if not self.showing_graphs:
+            return
+        if self.fig is None:
+            self.create_graphs_figure()
 
-            # Convert amounts to preferred currency for summary
-            total_income = sum(
-                self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-                for t in self.transactions if t.type == 'income'
-            )
-            total_expenses = sum(
-                self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-                for t in self.transactions if t.type == 'expense'
-            )
-            balance = total_income - total_expenses
+        # Get currency symbol for labels
+        currency = self.preferred_currency.get()
+        currency_symbol = self.currency_converter.currencies[currency]
+        relayout = currency != self.graph_currency
+        if relayout:
+            self.graph_currency = currency
+            self.balance_ax.set_ylabel(f'Balance ({currency_symbol})')
+            self.expense_ax.set_ylabel(f'Amount ({currency_symbol})')
+
+        analytics = self.analytics(self.get_transaction_store())
+
+        # Balance over time, no more points than the chart can show
+        dates, balances = downsample_series(*analytics.balance_history(), CHART_MAX_POINTS)
+        if self.balance_line is None:
+            if len(dates):  # Only plot if there are transactions
+                # The first plot sets up the date axis
+                self.balance_line, = self.balance_ax.plot(dates, balances, 'b-')
+                relayout = True
+        else:
+            self.balance_line.set_data(dates, balances)
+            self.balance_ax.relim()
+            self.balance_ax.autoscale_view()
 
-            elements.append(Paragraph(f"Balance: {currency_symbol}{balance:.2f}", summary_style))
-            elements.append(Paragraph(f"Total Income: {currency_symbol}{total_income:.2f}", summary_style))
-            elements.append(Paragraph(f"Total Expenses: {currency_symbol}{total_expenses:.2f}", summary_style))
-            elements.append(Spacer(1, 20))
+        # Income vs Expenses
+        for bar, height in zip(self.expense_bars, analytics.income_and_expenses()):
+            bar.set_height(height)
+        self.expense_ax.relim()
+        self.expense_ax.autoscale_view()
+
+        # Expenses by category, the pie is only rebuilt when the categories
+        # change, new amounts just move the wedges and their texts
+        category_expenses = analytics.category_expenses()
+        if set(category_expenses) != set(self.pie_categories or ()):
+            # Sort by amount for better visualization
+            pie_data = sorted(category_expenses.items(), key=lambda x: x[1], reverse=True)
+            self.pie_categories = [category for category, _ in pie_data]
+            self.category_ax.clear()
+            if pie_data:  # Only plot if there are expenses
+                categories, amounts = zip(*pie_data)
 
-            # Add transaction table first
-            elements.append(Paragraph("Transaction History", styles['Heading2']))
-            elements.append(Spacer(1, 12))
+                # Create custom labels with amounts
+                labels = [f'{cat}\n({currency_symbol}{amt:.2f})' for cat, amt in zip(categories, amounts)]
 
-            # Create table with automatic word wrapping
-            table_data = [['Date', 'Type', 'Category', 'Description', 'Amount']]
-            for transaction in reversed(self.transactions):
-                # Convert amount to preferred currency
-                converted_amount = self.currency_converter.convert_amount(
-                    transaction.amount,
-                    transaction.currency,
-                    self.preferred_currency.get()
-                )
-                
-                # Format amount with currency symbol
-                amount_str = self.currency_converter.format_amount(
-                    converted_amount,
-                    self.preferred_currency.get()
+                self.pie_wedges, self.pie_labels, self.pie_percents = self.category_ax.pie(
+                    amounts, labels=labels, autopct='%1.1f%%'
                 )
-                
-                # Add original amount if different currency
-                if (transaction.currency != self.preferred_currency.get() and 
-                    self.preferred_currency.get() == 'CZK' and 
-                    transaction.currency in ['EUR', 'USD']):
-                    original_amount = self.currency_converter.format_amount(
-                        transaction.amount,
-                        transaction.currency
-                    )
-                    amount_str = f"{amount_str} ({original_amount})"
+                self.category_ax.set_title('Expenses by Category')
+            else:
+                self.category_ax.set_axis_off()
+            relayout = True
+        elif self.pie_categories:
+            self.update_pie([category_expenses[category] for category in self.pie_categories],
+                            currency_symbol)
+
+        # Layout only changes with labels, plain data updates skip it
+        if relayout:
+            self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def update_pie(self, amounts, currency_symbol):
+        """Move the existing wedges and texts to new amounts, as Axes.pie places them"""
+        total = sum(amounts)
+        theta = 0.0
+        for category, amount, wedge, label, percent in zip(
+                self.pie_categories, amounts, self.pie_wedges, self.pie_labels, self.pie_percents):
+            span = 360.0 * amount / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            middle = math.radians(theta + span / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            label.set_text(f'{category}\n({currency_symbol}{amount:.2f})')
+            percent.set_position((0.6 * x, 0.6 * y))
+            percent.set_text(f'{100 * amount / total:.1f}%')
+            theta += span
 
-                table_data.append([
-                    transaction.date,
-                    transaction.type,
-                    transaction.category or '',
-                    Paragraph(transaction.description, styles['Normal']),
-                    amount_str
-                ])
+    def export_pdf(self):
+        if self.export_report is not None:
+            # One export at a time, bring its progress window forward
+            self.export_dialog.lift()
+            return
+        if self.transaction_loader is not None:
+            messagebox.showinfo("Export PDF", "Transactions are still loading, please try again in a moment.")
+            return
 
-            # Adjust column widths proportionally
-            available_width = letter[0] - doc.leftMargin - doc.rightMargin
-            col_widths = [
-                available_width * 0.15,  # Date
-                available_width * 0.15,  # Type
-                available_width * 0.2,   # Category
-                available_width * 0.35,  # Description
-                available_width * 0.15   # Amount
-            ]
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Export PDF")
+        dialog.geometry("340x230")
+        dialog.transient(self.root)
+        dialog.grab_set()
 
-            # Create table with adjusted properties
-            table = Table(table_data, colWidths=col_widths, repeatRows=1)
+        range_frame = ttk.Frame(dialog)
+        range_frame.pack(pady=(15, 5))
+        ttk.Checkbutton(
+            range_frame,
+            text="Only transactions from",
+            variable=self.export_limit_dates
+        ).grid(row=0, column=0, columnspan=2, sticky='w')
+        ttk.Label(range_frame, text="From:").grid(row=1, column=0, padx=5, pady=5)
+        start_entry = DateEntry(range_frame, width=12, background='darkblue',
+                                foreground='white', borderwidth=2,
+                                date_pattern='yyyy-mm-dd')
+        start_entry.set_date(date.today().replace(day=1))
+        start_entry.grid(row=1, column=1, padx=5, pady=5)
+        ttk.Label(range_frame, text="To:").grid(row=2, column=0, padx=5, pady=5)
+        end_entry = DateEntry(range_frame, width=12, background='darkblue',
+                              foreground='white', borderwidth=2,
+                              date_pattern='yyyy-mm-dd')
+        end_entry.grid(row=2, column=1, padx=5, pady=5)
+
+        ttk.Checkbutton(
+            dialog,
+            text="Summarize transactions by month",
+            variable=self.export_monthly
+        ).pack(anchor='w', padx=20)
+        # Vector charts keep reports small, raster charts look like the window
+        ttk.Checkbutton(
+            dialog,
+            text="Vector charts",
+            variable=self.vector_charts
+        ).pack(anchor='w', padx=20)
+
+        def start():
+            date_range = None
+            if self.export_limit_dates.get():
+                first, last = start_entry.get_date(), end_entry.get_date()
+                if first > last:
+                    messagebox.showerror("Error", "The start date must not be after the end date")
+                    return
+                date_range = (first.isoformat(), last.isoformat())
+            dialog.destroy()
+            self.start_export(date_range)
+
+        ttk.Button(dialog, text="Export", command=start).pack(pady=15)
+
+    def start_export(self, date_range=None):
+        # Create default filename with date
+        formatted_date = datetime.now().strftime("%Y-%m-%d")
+        default_filename = f"Balance Report of {formatted_date}.pdf"
+
+        # Ask user where to save the PDF
+        file_path = filedialog.asksaveasfilename(
+            initialfile=default_filename,
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save PDF Report"
+        )
 
-            # Update table style for better formatting
-            table_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),  # Amount column right-aligned
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ]
+        if not file_path:  # If user cancels the dialog
+            return
 
-            # Add row colors alternating
-            for i in range(1, len(table_data)):
-                if i % 2 == 0:
-                    table_style.append(('BACKGROUND', (0, i), (-1, i), colors.beige))
-                else:
-                    table_style.append(('BACKGROUND', (0, i), (-1, i), colors.whitesmoke))
+        try:
+            report = self.snapshot_report(date_range)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred while generating the PDF:\n{str(e)}")
+            return
 
-            table.setStyle(TableStyle(table_style))
-            elements.append(table)
-            elements.append(Spacer(1, 30))
+        self.export_report = report
+        self.export_button.config(state='disabled')
+        self.show_export_progress()
 
-            # Create graphs with proper currency labels
-            temp_dir = tempfile.mkdtemp()
-            graph_files = []
+        def worker():
+            try:
+                report.build(file_path, lambda fraction, message: self.export_updates.put(('progress', fraction, message)))
+                self.export_updates.put(('done',))
+            except ExportCancelled:
+                self.export_updates.put(('cancelled',))
+            except Exception as e:
+                self.export_updates.put(('error', str(e)))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_export_updates)
+
+    def snapshot_report(self, date_range=None):
+        """Copy what the report needs, so edits during the export don't affect it"""
+        store = self.get_transaction_store().copy()
+        return PdfReport(
+            store,
+            self.analytics(store),
+            self.preferred_currency.get(),
+            self.currency_converter,
+            vector_charts=self.vector_charts.get(),
+            date_range=date_range,
+            monthly_summary=self.export_monthly.get()
+        )
 
-            # Balance over time graph
-            balance_path = os.path.join(temp_dir, 'balance.png')
-            plt.figure(figsize=(10, 5))
-            
-            dates = []
-            balances = []
-            running_balance = 0
-            sorted_transactions = sorted(self.transactions, key=lambda x: x.date)
-            
-            for t in sorted_transactions:
-                dates.append(datetime.strptime(t.date, "%Y-%m-%d"))
-                # Convert amount to preferred currency
-                converted_amount = self.currency_converter.convert_amount(
-                    t.amount,
-                    t.currency,
-                    self.preferred_currency.get()
-                )
-                if t.type == 'income':
-                    running_balance += converted_amount
+    def show_export_progress(self):
+        # Not modal, the ledger stays editable while the report builds
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Exporting PDF")
+        dialog.geometry("320x130")
+        dialog.transient(self.root)
+        dialog.protocol("WM_DELETE_WINDOW", self.cancel_export)
+
+        self.export_status = ttk.Label(dialog, text="Preparing report...")
+        self.export_status.pack(pady=(15, 5))
+        self.export_progress = ttk.Progressbar(dialog, mode='determinate', maximum=100, length=280)
+        self.export_progress.pack(pady=5)
+        ttk.Button(dialog, text="Cancel", command=self.cancel_export).pack(pady=10)
+        self.export_dialog = dialog
+
+    def cancel_export(self):
+        if self.export_report is not None:
+            self.export_report.cancel()
+            self.export_status.config(text="Cancelling...")
+
+    def poll_export_updates(self):
+        # Only the latest progress matters, finish messages end the export
+        result = None
+        try:
+            while True:
+                update = self.export_updates.get_nowait()
+                if update[0] == 'progress':
+                    if not self.export_report.cancelled.is_set():
+                        self.export_progress['value'] = update[1] * 100
+                        self.export_status.config(text=update[2])
                 else:
-                    running_balance -= converted_amount
-                balances.append(running_balance)
-
-            if dates:
-                plt.plot(dates, balances, 'b-')
-                plt.title('Balance Over Time')
-                plt.xlabel('Date')
-                plt.ylabel(f'Balance ({currency_symbol})')
-                plt.xticks(rotation=45)
-                
-                # Format y-axis with currency symbol
-                def format_amount(x, p):
-                    return f'{currency_symbol}{x:,.0f}'
-                plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(format_amount))
-                
-                plt.tight_layout(pad=1.5)
-            plt.savefig(balance_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            graph_files.append(balance_path)
-
-            # Income vs Expenses graph
-            expense_path = os.path.join(temp_dir, 'expense.png')
-            plt.figure(figsize=(8, 6))
-            
-            # Convert amounts to preferred currency
-            income = sum(
-                self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-                for t in self.transactions if t.type == 'income'
-            )
-            expenses = sum(
-                self.currency_converter.convert_amount(t.amount, t.currency, self.preferred_currency.get())
-                for t in self.transactions if t.type == 'expense'
-            )
-            
-            plt.bar(['Income', 'Expenses'], [income, expenses], color=['g', 'r'], width=0.6)
-            plt.title('Income vs Expenses')
-            plt.ylabel(f'Amount ({currency_symbol})')
-            
-            # Format y-axis with currency symbol
-            plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(format_amount))
-            
-            plt.tight_layout(pad=1.5)
-            plt.savefig(expense_path, bbox_inches='tight', dpi=300)
-            plt.close()
-            graph_files.append(expense_path)
-
-            # Category pie chart
-            category_path = os.path.join(temp_dir, 'category.png')
-            plt.figure(figsize=(8, 8))
-            category_expenses = defaultdict(float)
-            
-            # Convert amounts to preferred currency for categories
-            for t in self.transactions:
-                if t.type == 'expense':
-                    converted_amount = self.currency_converter.convert_amount(
-                        t.amount,
-                        t.currency,
-                        self.preferred_currency.get()
-                    )
-                    category_expenses[t.category or 'Uncategorized'] += converted_amount
+                    result = update
+        except queue.Empty:
+            pass
 
-            if category_expenses:
-                categories = list(category_expenses.keys())
-                amounts = list(category_expenses.values())
-                
-                sorted_data = sorted(zip(categories, amounts), key=lambda x: x[1], reverse=True)
-                categories, amounts = zip(*sorted_data)
-                
-                # Create labels with converted amounts
-                labels = [f'{cat}\n({currency_symbol}{amt:.2f})' for cat, amt in zip(categories, amounts)]
-                
-                plt.pie(amounts, 
-                       labels=labels,
-                       autopct='%1.1f%%',
-                       startangle=90,
-                       counterclock=False,
-                       pctdistance=0.85,
-                       labeldistance=1.1)
-                plt.title('Expenses by Category')
-                plt.axis('equal')
-
-            plt.savefig(category_path, bbox_inches='tight', dpi=300, pad_inches=0.5)
-            plt.close()
-            graph_files.append(category_path)
-
-            # Add graphs with their titles
-            add_graph_section("Balance History", balance_path, 7*inch, 3.5*inch)
-            add_graph_section("Income vs Expenses", expense_path, 6*inch, 4.5*inch)
-            add_graph_section("Expense Categories", category_path, 6*inch, 6*inch)
-
-            # Generate PDF
-            doc.build(elements)
-
-            # Clean up temporary files
-            for file in graph_files:
-                if os.path.exists(file):
-                    os.remove(file)
-            os.rmdir(temp_dir)
+        if result is None:
+            self.root.after(100, self.poll_export_updates)
+            return
 
+        self.export_dialog.destroy()
+        self.export_report = None
+        self.export_button.config(state='normal')
+        if result[0] == 'done':
             messagebox.showinfo("Success", "PDF report has been generated successfully!")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while generating the PDF:\n{str(e)}")
+        elif result[0] == 'error':
+            messagebox.showerror("Error", f"An error occurred while generating the PDF:\n{result[1]}")
 
     def add_transaction(self):
         try:
@@ -834,19 +2312,29 @@ class BudgetTracker:
 
             if self.editing:
                 # Update existing transaction
-                self.transactions[self.edit_index].amount = amount
-                self.transactions[self.edit_index].type = type_
-                self.transactions[self.edit_index].category = category
-                self.transactions[self.edit_index].description = description
-                self.transactions[self.edit_index].date = date
-                self.transactions[self.edit_index].currency = currency
+                transaction = self.edited_transaction
+                self.unindex_transaction(transaction)
+                old_ordinal = transaction.ordinal
+                transaction.amount = amount
+                transaction.type = type_
+                transaction.category = category
+                transaction.description = description
+                transaction.date = date
+                transaction.currency = currency
+                if transaction.ordinal != old_ordinal:
+                    # Move it to its new place in date order
+                    self.transactions.remove(transaction)
+                    self.insert_transaction(transaction)
+                self.index_transaction(transaction)
                 self.end_editing()
+                self.record_transaction('update', transaction)
             else:
                 # Add new transaction
                 transaction = Transaction(amount, type_, category, description, date, currency)
-                self.transactions.append(transaction)
+                self.insert_transaction(transaction)
+                self.index_transaction(transaction)
+                self.record_transaction('add', transaction)
 
-            self.save_transactions()
             self.update_display()
             self.clear_inputs()
 
@@ -861,21 +2349,7 @@ class BudgetTracker:
         self.update_budget_display()
 
     def update_summary(self):
-        income = 0
-        expenses = 0
-
-        for t in self.transactions:
-            # Convert each transaction to the preferred currency before summing
-            converted_amount = self.currency_converter.convert_amount(
-                t.amount,
-                t.currency,
-                self.preferred_currency.get(),
-            )
-            if t.type == 'income':
-                income += converted_amount
-            else:
-                expenses += converted_amount
-                
+        income, expenses = self.income_and_expenses()
         balance = income - expenses
         
         # Format amounts with proper spacing and commas
@@ -889,81 +2363,400 @@ class BudgetTracker:
             self.income_label.config(text=f"Income: {currency_symbol}{income:,.2f}")
             self.expenses_label.config(text=f"Expenses: {currency_symbol}{expenses:,.2f}")
 
+    def income_and_expenses(self):
+        """Total income and expenses in the preferred currency"""
+        # Running totals are kept per currency, so this is one conversion
+        # per currency instead of one per transaction
+        rows = self.totals.rows()
+        converted = self.currency_converter.convert_many(
+            [total for _, _, total in rows],
+            [currency for _, currency, _ in rows],
+            self.preferred_currency.get()
+        )
+        income = 0
+        expenses = 0
+        for (type_, _, _), converted_amount in zip(rows, converted):
+            if type_ == 'income':
+                income += converted_amount
+            else:
+                expenses += converted_amount
+        return income, expenses
+
     def update_transaction_list(self):
-        for item in self.tree.get_children():
+        virtual_mode = len(self.transactions) > VIRTUAL_LIST_THRESHOLD
+        if virtual_mode != self.virtual_mode:
+            self.set_virtual_mode(virtual_mode)
+
+        if self.virtual_mode:
+            self.virtual_row_cache.clear()
+            self.render_virtual_rows()
+            return
+
+        # Rows are shown newest first, i.e. in reverse list order
+        ordered = self.transactions[::-1]
+        wanted_ids = {t.id for t in ordered}
+
+        # Remove rows whose transactions are gone
+        for transaction_id in [tid for tid in self.tree_items if tid not in wanted_ids]:
+            item = self.tree_items.pop(transaction_id)
+            del self.item_transactions[item]
+            del self.tree_values[transaction_id]
             self.tree.delete(item)
 
-        for transaction in reversed(self.transactions):
-            # Convert amount to preferred currency for display
-            converted_amount = self.currency_converter.convert_amount(
+        # Existing rows only need moving if their relative order changed
+        existing = [self.tree_items[t.id] for t in ordered if t.id in self.tree_items]
+        reorder = list(self.tree.get_children()) != existing
+
+        converted = self.display_amounts(ordered)
+        for position, transaction in enumerate(ordered):
+            values = self.transaction_row_values(transaction, converted[position])
+            item = self.tree_items.get(transaction.id)
+            if item is None:
+                item = self.tree.insert('', position, values=values)
+                self.tree_items[transaction.id] = item
+            else:
+                if self.tree_values[transaction.id] != values:
+                    self.tree.item(item, values=values)
+                if reorder:
+                    self.tree.move(item, '', position)
+            self.item_transactions[item] = transaction
+            self.tree_values[transaction.id] = values
+
+    def display_amounts(self, transactions):
+        """Amounts of the given transactions in the preferred currency"""
+        return self.currency_converter.convert_many(
+            [t.amount for t in transactions],
+            [t.currency for t in transactions],
+            self.preferred_currency.get()
+        )
+
+    def transaction_row_values(self, transaction, converted_amount):
+        # Format amount with currency symbol
+        amount_str = self.currency_converter.format_amount(
+            converted_amount,
+            self.preferred_currency.get()
+        )
+        
+        # Show original amount only when converting to CZK from EUR/USD
+        if (transaction.currency != self.preferred_currency.get() and 
+            self.preferred_currency.get() == 'CZK' and 
+            transaction.currency in ['EUR', 'USD']):
+            original_amount = self.currency_converter.format_amount(
                 transaction.amount,
-                transaction.currency,
-                self.preferred_currency.get()
+                transaction.currency
             )
-            
-            # Format amount with currency symbol
-            amount_str = self.currency_converter.format_amount(
-                converted_amount,
-                self.preferred_currency.get()
-            )
-            
-            # Show original amount only when converting to CZK from EUR/USD
-            if (transaction.currency != self.preferred_currency.get() and 
-                self.preferred_currency.get() == 'CZK' and 
-                transaction.currency in ['EUR', 'USD']):
-                original_amount = self.currency_converter.format_amount(
-                    transaction.amount,
-                    transaction.currency
-                )
-                amount_str = f"{amount_str} ({original_amount})"
+            amount_str = f"{amount_str} ({original_amount})"
+
+        return (
+            transaction.date,
+            transaction.type,
+            transaction.category,
+            transaction.description,
+            amount_str
+        )
 
-            self.tree.insert('', 'end', values=(
-                transaction.date,
-                transaction.type,
-                transaction.category,
-                transaction.description,
-                amount_str
-            ))
+    def set_virtual_mode(self, enabled):
+        """Switch between one tree row per transaction and a fixed set of viewport rows"""
+        self.tree.delete(*self.tree.get_children())
+        self.tree_items.clear()
+        self.item_transactions.clear()
+        self.tree_values.clear()
+        self.virtual_mode = enabled
+        self.virtual_offset = 0
+        self.virtual_row_cache.clear()
+        if enabled:
+            # The tree only ever holds what fits, so the scrollbar is driven by us
+            self.tree.configure(yscrollcommand='')
+        else:
+            self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
+
+    def visible_row_count(self):
+        height = self.tree.winfo_height()
+        if self.tree_row_height is None or height <= 1:
+            # Not mapped yet, fall back to the requested height in rows
+            return int(self.tree.cget('height'))
+        return max(1, (height - self.tree_heading_height) // self.tree_row_height)
+
+    def render_virtual_rows(self):
+        """Fill the viewport rows from the transactions at virtual_offset"""
+        total = len(self.transactions)
+        count = min(self.visible_row_count(), total)
+        self.virtual_offset = max(0, min(self.virtual_offset, total - count))
+
+        rows = self.tree.get_children()
+        if len(rows) > count:
+            self.tree.delete(*rows[count:])
+        for i in range(len(rows), count):
+            self.tree.insert('', 'end', iid=f"row{i}")
+
+        # Drop cached rows that scrolled out of the buffer around the viewport
+        low = self.virtual_offset - VIRTUAL_LIST_BUFFER
+        high = self.virtual_offset + count + VIRTUAL_LIST_BUFFER
+        for position in [p for p in self.virtual_row_cache if not low <= p < high]:
+            del self.virtual_row_cache[position]
+
+        # Rows are shown newest first, i.e. in reverse list order
+        positions = range(self.virtual_offset, self.virtual_offset + count)
+        missing = [p for p in positions if p not in self.virtual_row_cache]
+        if missing:
+            transactions = [self.transactions[total - 1 - p] for p in missing]
+            converted = self.display_amounts(transactions)
+            for position, transaction, converted_amount in zip(missing, transactions, converted):
+                self.virtual_row_cache[position] = self.transaction_row_values(transaction, converted_amount)
+        for i, position in enumerate(positions):
+            self.tree.item(f"row{i}", values=self.virtual_row_cache[position])
+
+        if count and self.tree_row_height is None:
+            bbox = self.tree.bbox("row0")
+            if bbox:
+                self.tree_heading_height = bbox[1]
+                self.tree_row_height = bbox[3]
+
+        if total:
+            self.tree_scrollbar.set(self.virtual_offset / total, (self.virtual_offset + count) / total)
+        else:
+            self.tree_scrollbar.set(0, 1)
+
+    def scroll_virtual_rows(self, offset):
+        total = len(self.transactions)
+        offset = max(0, min(offset, total - min(self.visible_row_count(), total)))
+        if offset == self.virtual_offset:
+            return
+        # Row items are reused for other transactions, so selection can't follow
+        self.tree.selection_remove(*self.tree.selection())
+        self.virtual_offset = offset
+        self.render_virtual_rows()
+
+    def on_tree_scroll(self, *args):
+        if not self.virtual_mode:
+            self.tree.yview(*args)
+            return
+
+        if args[0] == 'moveto':
+            self.scroll_virtual_rows(int(float(args[1]) * len(self.transactions)))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_row_count()
+            self.scroll_virtual_rows(self.virtual_offset + step)
+
+    def on_tree_mousewheel(self, event):
+        if not self.virtual_mode:
+            return None
+
+        if event.num == 4 or event.delta > 0:
+            self.scroll_virtual_rows(self.virtual_offset - 3)
+        else:
+            self.scroll_virtual_rows(self.virtual_offset + 3)
+        return "break"
+
+    def on_tree_key(self, event):
+        """Keyboard navigation over the whole ledger, scrolling past the viewport"""
+        rows = self.tree.get_children()
+        if not self.virtual_mode or not rows:
+            return None
+
+        total = len(self.transactions)
+        focus = self.tree.focus()
+        if focus not in rows and event.keysym in ('Up', 'Down'):
+            # Nothing focused yet, start at the top visible row
+            target = self.virtual_offset
+        else:
+            position = self.virtual_offset + (rows.index(focus) if focus in rows else 0)
+            target = {
+                'Up': position - 1,
+                'Down': position + 1,
+                'Prior': position - len(rows),
+                'Next': position + len(rows),
+                'Home': 0,
+                'End': total - 1
+            }[event.keysym]
+        target = max(0, min(target, total - 1))
+        if target < self.virtual_offset:
+            self.scroll_virtual_rows(target)
+        elif target >= self.virtual_offset + len(rows):
+            self.scroll_virtual_rows(target - len(rows) + 1)
+
+        item = f"row{target - self.virtual_offset}"
+        self.tree.focus(item)
+        self.tree.selection_set(item)
+        return "break"
+
+    def on_tree_resize(self, event):
+        if self.virtual_mode:
+            self.render_virtual_rows()
+
+    def transaction_for_item(self, item):
+        """The transaction shown in a tree row"""
+        if self.virtual_mode:
+            # Virtual rows are named row0..rowN from the top of the viewport
+            position = self.virtual_offset + int(item[len("row"):])
+            return self.transactions[len(self.transactions) - 1 - position]
+        return self.item_transactions[item]
 
     def save_transactions(self):
-        data = [t.to_dict() for t in self.transactions]
-        with open('transactions.json', 'w') as f:
-            json.dump(data, f)
+        """Write all transactions at once (compacts the JSON journal)"""
+        if self.transaction_loader is not None:
+            # A snapshot now would drop the rows that aren't loaded yet
+            self.save_after_load = True
+            return
+        # Newest first, so the next start can show them before reading the rest
+        snapshot = [t.to_dict() for t in reversed(self.transactions)]
+
+        def write():
+            self.storage.save_transactions(snapshot)
+            self.compaction_queued = False
+
+        self.compaction_queued = True
+        self.persister.save('transactions', write)
+
+    def record_transaction(self, op, transaction):
+        """Persist a single change without rewriting the other transactions"""
+        # Records queued in a burst are written together
+        record = (op, transaction.id, None if op == 'delete' else transaction.to_dict())
+        self.persister.add('transactions', record, self.storage.record_transactions)
+        # The log only shrinks once the writer has written the snapshot
+        if self.storage.needs_compaction and not self.compaction_queued:
+            self.save_transactions()
 
     def load_transactions(self):
-        if os.path.exists('transactions.json'):
-            try:
-                with open('transactions.json', 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        transactions_data = data
-                    else:
-                        transactions_data = data.get('transactions', [])
-
-                    for t_dict in transactions_data:
-                        t = Transaction(
-                            t_dict['amount'],
-                            t_dict['type'],
-                            t_dict['category'],
-                            t_dict['description']
-                        )
-                        t.id = t_dict['id']
-                        t.date = t_dict['date']
-                        # Set currency to CZK if not present in the data
-                        t.currency = t_dict.get('currency', 'CZK')
-                        self.transactions.append(t)
-                    
-                    # Sort transactions by date (newest first)
-                    self.transactions.sort(key=lambda x: x.date, reverse=True)
-            except (json.JSONDecodeError, FileNotFoundError):
-                messagebox.showwarning(
-                    "File Error",
-                    "Could not load transactions file. Starting with empty transactions."
-                )
-                self.transactions = []
+        """Load the newest transactions now and stream in the rest.
+
+        Rows are parsed and turned into Transactions one at a time. The first
+        LOAD_FIRST_ROWS are loaded before returning, the remainder in steps
+        from the event loop while the window is already usable.
+        """
+        self.cancel_transaction_loading()
+        self.transactions = []
+        self.loaded_ids = set()
+        self.duplicate_ids = False
+        self.save_after_load = False
+        self.rebuild_indexes()
+        self.transaction_loader = self.storage.iter_transactions()
+        self.load_transaction_chunk(LOAD_FIRST_ROWS)
+        # Budget spending covers the first rows until loading completes
+        self.rebuild_indexes()
+        if self.transaction_loader is not None:
+            self.root.after(1, self.load_more_transactions, self.transaction_loader)
+
+    def load_more_transactions(self, loader):
+        if loader is not self.transaction_loader:
+            # Superseded by a refresh
+            return
+        self.load_transaction_chunk(LOAD_CHUNK_ROWS)
+        if self.transaction_loader is None:
+            self.update_display()
         else:
-            with open('transactions.json', 'w') as f:
-                json.dump([], f)
+            self.update_summary()
+            self.update_transaction_list()
+            self.root.after(1, self.load_more_transactions, loader)
+
+    def load_transaction_chunk(self, size):
+        """Add up to size more transactions from the loader"""
+        chunk = []
+        try:
+            for t_dict in islice(self.transaction_loader, size):
+                t = Transaction.from_dict(t_dict)
+                # Older files used second resolution ids which can collide
+                if t.id in self.loaded_ids:
+                    t.id = Transaction.new_id()
+                    self.duplicate_ids = True
+                self.loaded_ids.add(t.id)
+                chunk.append(t)
+        except (json.JSONDecodeError, FileNotFoundError, KeyError, ValueError, sqlite3.Error):
+            messagebox.showwarning(
+                "File Error",
+                "Could not load transactions file. Starting with empty transactions."
+            )
+            self.cancel_transaction_loading()
+            self.transactions = []
+            self.rebuild_indexes()
+            return
+
+        # Keep transactions in date order (oldest first, shown newest first).
+        # Rows arrive newest first, so a chunk normally goes in front.
+        chunk.sort(key=lambda x: x.ordinal)
+        if not chunk or not self.transactions or chunk[-1].ordinal <= self.transactions[0].ordinal:
+            self.transactions[:0] = chunk
+        else:
+            self.transactions.extend(chunk)
+            self.transactions.sort(key=lambda x: x.ordinal)
+        for t in chunk:
+            self.totals.add(t)
+        self.transaction_store = None
+
+        if len(chunk) < size:
+            self.transaction_loader = None
+            self.loaded_ids = None
+            self.rebuild_indexes()
+            # Persist reassigned ids so journal records stay unambiguous
+            if self.duplicate_ids or self.save_after_load or self.storage.needs_compaction:
+                self.save_transactions()
+
+    def cancel_transaction_loading(self):
+        if self.transaction_loader is not None:
+            self.transaction_loader.close()
+            self.transaction_loader = None
+
+    def insert_transaction(self, transaction):
+        """Insert keeping self.transactions in date order, after same-day entries"""
+        low, high = 0, len(self.transactions)
+        while low < high:
+            mid = (low + high) // 2
+            if transaction.ordinal < self.transactions[mid].ordinal:
+                high = mid
+            else:
+                low = mid + 1
+        self.transactions.insert(low, transaction)
+
+    def index_transaction(self, transaction):
+        """Add a transaction to the running totals, spending index and store"""
+        self.totals.add(transaction)
+        self.spending_index.add(transaction)
+        store = self.transaction_store
+        if store is not None:
+            # Same row as in self.transactions, which may hold same-day entries
+            index = self.transactions.index(transaction, bisect_left(store.ordinals, transaction.ordinal))
+            store.insert(index, transaction)
+
+    def unindex_transaction(self, transaction):
+        """Remove a transaction from the running totals, spending index and store"""
+        self.totals.remove(transaction)
+        self.spending_index.remove(transaction)
+        if self.transaction_store is not None:
+            self.transaction_store.remove(transaction)
+
+    def rebuild_indexes(self):
+        self.totals = TransactionTotals(self.transactions)
+        self.spending_index = SpendingIndex(self.transactions, self.spending_amount)
+        self.transaction_store = None
+
+    def get_transaction_store(self):
+        """Columnar copy of self.transactions, built on first use"""
+        if self.transaction_store is None:
+            self.transaction_store = TransactionStore(self.transactions)
+        return self.transaction_store
+
+    def spending_amount(self, transaction):
+        """Amount in CZK at the rate of the transaction's date, as budgets are kept in CZK"""
+        return self.currency_converter.convert_amount(
+            transaction.amount,
+            transaction.currency,
+            'CZK',
+            transaction.ordinal
+        )
+
+    def analytics(self, store):
+        """Analytics over a TransactionStore of the ledger in the preferred currency"""
+        # Each transaction is converted at the rate of its own date
+        amounts = self.currency_converter.convert_many(
+            np.array(store.amounts),
+            store.currency_codes,
+            self.preferred_currency.get(),
+            dates=store.ordinals,
+            currency_names=store.currencies
+        )
+        return AnalyticsEngine(store, amounts)
 
     def on_select(self, event):
         self.selected_items = self.tree.selection()
@@ -988,21 +2781,25 @@ class BudgetTracker:
 
         if messagebox.askyesno("Confirm Delete", 
                               f"Are you sure you want to delete {len(self.selected_items)} transaction(s)?"):
-            # Get indices of all selected items
-            indices = []
+            # Look up the selected transactions by tree item
+            deleted = {}
             for item in self.selected_items:
-                index = len(self.transactions) - 1 - self.tree.index(item)
-                indices.append(index)
-            
-            # Sort indices in descending order to avoid index shifting when deleting
-            indices.sort(reverse=True)
-            
-            # Delete transactions
-            for index in indices:
-                del self.transactions[index]
-            
-            # Save and update display
-            self.save_transactions()
+                transaction = self.transaction_for_item(item)
+                deleted[transaction.id] = transaction
+
+            # Delete transactions in a single pass over the list
+            self.transactions = [t for t in self.transactions if t.id not in deleted]
+            if len(deleted) > 1:
+                # One rebuild is cheaper than shifting every column per row
+                self.transaction_store = None
+            for transaction in deleted.values():
+                self.unindex_transaction(transaction)
+                self.record_transaction('delete', transaction)
+
+            if self.editing and self.edited_transaction.id in deleted:
+                self.cancel_edit()
+
+            # Update display
             self.update_display()
 
     def edit_transaction(self):
@@ -1010,15 +2807,14 @@ class BudgetTracker:
             return
 
         # Get the selected transaction
-        index = len(self.transactions) - 1 - self.tree.index(self.selected_items[0])
-        transaction = self.transactions[index]
+        transaction = self.transaction_for_item(self.selected_items[0])
 
         # Set editing mode
         self.editing = True
-        self.edit_index = index
+        self.edited_transaction = transaction
 
         # Fill the form with transaction data
-        self.date_entry.set_date(datetime.strptime(transaction.date, "%Y-%m-%d"))
+        self.date_entry.set_date(date.fromordinal(transaction.ordinal))
         self.amount_entry.delete(0, tk.END)
         self.amount_entry.insert(0, str(transaction.amount))
         self.type_var.set(transaction.type)
@@ -1046,7 +2842,7 @@ class BudgetTracker:
 
     def end_editing(self):
         self.editing = False
-        self.edit_index = None
+        self.edited_transaction = None
         self.action_button.config(text="Add Transaction")
         self.cancel_button.grid_remove()
 
@@ -1181,6 +2977,15 @@ class BudgetTracker:
         self.budget_menu = tk.Menu(self.root, tearoff=0)
         self.budget_menu.add_command(label="Delete Budget", command=self.delete_budget)
 
+        # Status colors used as row tags
+        for status_color in ('red', 'orange', 'green'):
+            self.budget_tree.tag_configure(status_color, foreground=status_color)
+
+        # Each budget keeps its own tree item so refreshes only touch changed rows
+        self.budget_items = {}  # category -> tree item id
+        self.budget_item_categories = {}  # tree item id -> category
+        self.budget_values = {}  # category -> displayed values
+
     def show_budgets(self):
         self.showing_graphs = False
         self.transactions_frame.pack_forget()
@@ -1230,25 +3035,27 @@ class BudgetTracker:
         self.budget_currency_var.set('CZK')
 
     def update_budget_display(self):
-        for item in self.budget_tree.get_children():
+        # Remove rows of deleted budgets
+        for category in [c for c in self.budget_items if c not in self.budgets]:
+            item = self.budget_items.pop(category)
+            del self.budget_item_categories[item]
+            del self.budget_values[category]
             self.budget_tree.delete(item)
 
-        for category, budget in self.budgets.items():
-            # Convert budget amount to preferred currency
-            converted_amount = self.currency_converter.convert_amount(
-                budget['amount'],
-                'CZK',  # Budgets are stored in CZK
-                self.preferred_currency.get()
-            )
-            
-            spent = self.calculate_spending(category, budget['period'])
-            # Convert spent amount to preferred currency
-            converted_spent = self.currency_converter.convert_amount(
-                spent,
-                'CZK',  # Spending is calculated in CZK
-                self.preferred_currency.get()
-            )
-            
+        budgets = list(self.budgets.items())
+        amounts = [budget['amount'] for _, budget in budgets]
+        spent = [self.calculate_spending(category, budget['period']) for category, budget in budgets]
+        # Budgets and spending are both kept in CZK, convert them in one batch
+        converted = self.currency_converter.convert_many(
+            amounts + spent,
+            ['CZK'] * (len(amounts) + len(spent)),
+            self.preferred_currency.get()
+        )
+
+        for position, (category, budget) in enumerate(budgets):
+            converted_amount = converted[position]
+            converted_spent = converted[len(budgets) + position]
+
             remaining = converted_amount - converted_spent
             
             # Format amounts with currency symbol
@@ -1276,37 +3083,39 @@ class BudgetTracker:
                 status = "On Track"
                 status_color = 'green'
 
-            item = self.budget_tree.insert('', 'end', values=(
+            values = (
                 category,
                 budget['period'],
                 amount_str,
                 spent_str,
                 remaining_str,
                 status
-            ))
-            
-            self.budget_tree.tag_configure(status_color, foreground=status_color)
-            self.budget_tree.item(item, tags=(status_color,))
+            )
+
+            # Only touch rows that are new or changed
+            item = self.budget_items.get(category)
+            if item is None:
+                item = self.budget_tree.insert('', position, values=values, tags=(status_color,))
+                self.budget_items[category] = item
+                self.budget_item_categories[item] = category
+            elif self.budget_values[category] != values:
+                self.budget_tree.item(item, values=values, tags=(status_color,))
+            self.budget_values[category] = values
 
     def calculate_spending(self, category, period):
-        total = 0
-        now = datetime.now()
+        today = date.today()
         
         if period == 'Monthly':
-            start_date = datetime(now.year, now.month, 1)
-            _, last_day = monthrange(now.year, now.month)
-            end_date = datetime(now.year, now.month, last_day)
+            start_date = date(today.year, today.month, 1)
+            _, last_day = monthrange(today.year, today.month)
+            end_date = date(today.year, today.month, last_day)
         else:  # Weekly
-            start_date = now - timedelta(days=now.weekday())
+            start_date = today - timedelta(days=today.weekday())
             end_date = start_date + timedelta(days=6)
 
-        for transaction in self.transactions:
-            if (transaction.type == 'expense' and 
-                transaction.category == category and
-                start_date <= datetime.strptime(transaction.date, "%Y-%m-%d") <= end_date):
-                total += transaction.amount
-
-        return total
+        # Answered from memory for both backends, the database may not
+        # have the latest edits yet while they wait to be written
+        return self.spending_index.total(category, start_date.toordinal(), end_date.toordinal())
 
     def show_budget_context_menu(self, event):
         item = self.budget_tree.identify_row(event.y)
@@ -1319,23 +3128,19 @@ class BudgetTracker:
         if not selected:
             return
 
-        category = self.budget_tree.item(selected[0])['values'][0]
+        category = self.budget_item_categories[selected[0]]
         if messagebox.askyesno("Confirm Delete", f"Delete budget for {category}?"):
             del self.budgets[category]
             self.save_budgets()
             self.update_budget_display()
 
     def save_budgets(self):
-        with open('budgets.json', 'w') as f:
-            json.dump(self.budgets, f)
+        snapshot = copy.deepcopy(self.budgets)
+        self.persister.save('budgets', lambda: self.storage.save_budgets(snapshot))
 
     def load_budgets(self):
         try:
-            if os.path.exists('budgets.json'):
-                with open('budgets.json', 'r') as f:
-                    self.budgets = json.load(f)
-            else:
-                self.budgets = {}
+            self.budgets = self.storage.load_budgets()
         except:
             self.budgets = {}
 
@@ -1425,8 +3230,8 @@ class BudgetTracker:
         self.graphs_frame.pack_forget()
         self.budgets_frame.pack_forget()
         
-        # Reload savings goals data before showing the frame
-        self.load_savings_goals()
+        # Pick up goals changed outside the app before showing the frame
+        self.reload_savings_goals_if_changed()
         self.update_savings_display()
         
         self.savings_frame.pack(fill="both", expand=True)
@@ -1452,6 +3257,7 @@ class BudgetTracker:
 
         deadline = self.goal_date_entry.get_date().strftime("%Y-%m-%d")
         currency = self.goal_currency_var.get()
+        self.reload_savings_goals_if_changed()
         
         # Convert amounts to CZK for storage
         if currency != 'CZK':
@@ -1489,12 +3295,12 @@ class BudgetTracker:
         
         goal_name = str(values[0])  # Convert to string to ensure consistent type
         
+        # Another program may have changed or removed the goal
+        self.reload_savings_goals_if_changed()
         if goal_name not in self.savings_goals:
-            # Try reloading goals from file
-            self.load_savings_goals()
-            if goal_name not in self.savings_goals:
-                messagebox.showerror("Error", "Could not find the selected goal")
-                return
+            messagebox.showerror("Error", "Could not find the selected goal")
+            self.update_savings_display()
+            return
         
         # Create contribution dialog
         dialog = tk.Toplevel(self.root)
@@ -1513,7 +3319,13 @@ class BudgetTracker:
                 if amount <= 0:
                     messagebox.showerror("Error", "Please enter a positive amount")
                     return
-                
+
+                self.reload_savings_goals_if_changed()
+                if goal_name not in self.savings_goals:
+                    messagebox.showerror("Error", "Could not find the selected goal")
+                    dialog.destroy()
+                    self.update_savings_display()
+                    return
                 self.savings_goals[goal_name]['current'] += amount
                 self.savings_goals[goal_name]['contributions'].append({
                     'amount': amount,
@@ -1534,27 +3346,20 @@ class BudgetTracker:
             for item in self.savings_tree.get_children():
                 self.savings_tree.delete(item)
 
-            self.load_savings_goals()
+            # Goals are stored in CZK, convert them to the preferred currency
+            # in one batch
+            goals = list(self.savings_goals.items())
+            converted = iter(self.currency_converter.convert_many(
+                [goal[key] for _, goal in goals for key in ('target', 'current', 'monthly')],
+                ['CZK'] * (3 * len(goals)),
+                self.preferred_currency.get()
+            ))
 
-            for name, goal in self.savings_goals.items():
+            for name, goal in goals:
+                converted_target, converted_current, converted_monthly = (
+                    next(converted), next(converted), next(converted)
+                )
                 try:
-                    # Convert amounts to preferred currency
-                    converted_target = self.currency_converter.convert_amount(
-                        goal['target'],
-                        'CZK',  # Goals are stored in CZK
-                        self.preferred_currency.get()
-                    )
-                    converted_current = self.currency_converter.convert_amount(
-                        goal['current'],
-                        'CZK',
-                        self.preferred_currency.get()
-                    )
-                    converted_monthly = self.currency_converter.convert_amount(
-                        goal['monthly'],
-                        'CZK',
-                        self.preferred_currency.get()
-                    )
-                    
                     # Calculate progress using converted amounts
                     progress = (converted_current / converted_target) * 100
                     
@@ -1610,41 +3415,53 @@ class BudgetTracker:
         
         if messagebox.askyesno("Confirm Delete", f"Delete savings goal: {goal_name}?"):
             try:
+                self.reload_savings_goals_if_changed()
                 if goal_name in self.savings_goals:
                     del self.savings_goals[goal_name]
                     self.save_savings_goals()
                     self.update_savings_display()
                     messagebox.showinfo("Success", f"Goal '{goal_name}' has been deleted.")
                 else:
-                    # Reload goals from file and try again
-                    self.load_savings_goals()
-                    if goal_name in self.savings_goals:
-                        del self.savings_goals[goal_name]
-                        self.save_savings_goals()
-                        self.update_savings_display()
-                        messagebox.showinfo("Success", f"Goal '{goal_name}' has been deleted.")
-                    else:
-                        messagebox.showerror("Error", f"Could not find goal: {goal_name}")
+                    self.update_savings_display()
+                    messagebox.showerror("Error", f"Could not find goal: {goal_name}")
             except Exception as e:
                 messagebox.showerror("Error", f"Error deleting goal: {str(e)}")
 
     def save_savings_goals(self):
-        with open('savings_goals.json', 'w') as f:
-            json.dump(self.savings_goals, f)
+        snapshot = copy.deepcopy(self.savings_goals)
+
+        def write():
+            self.storage.save_savings_goals(snapshot)
+            self.savings_goals_version = self.storage.savings_goals_version()
+
+        self.persister.save('savings_goals', write)
 
     def load_savings_goals(self):
+        """Load savings goals, skipping entries with missing fields"""
+        required = ['target', 'current', 'monthly', 'deadline', 'contributions']
         try:
-            if os.path.exists('savings_goals.json'):
-                with open('savings_goals.json', 'r') as f:
-                    self.savings_goals = json.load(f)
-            else:
-                self.savings_goals = {}
+            self.savings_goals = {
+                name: goal for name, goal in self.storage.load_savings_goals().items()
+                if all(key in goal for key in required)
+            }
         except:
             self.savings_goals = {}
+        self.savings_goals_version = self.storage.savings_goals_version()
+
+    def reload_savings_goals_if_changed(self):
+        """Re-read the goals only if storage was changed by something else"""
+        if self.persister.busy('savings_goals'):
+            # Our own unsaved changes are newer than what's stored
+            return
+        if self.storage.savings_goals_version() != self.savings_goals_version:
+            self.load_savings_goals()
 
     def refresh_data(self):
         """Reload all data from files and update displays"""
         try:
+            # Write pending changes first so they aren't lost by the reload
+            self.persister.flush()
+
             # Clear current data
             self.transactions = []
             self.budgets = {}
@@ -1662,6 +3479,50 @@ class BudgetTracker:
         except Exception as e:
             messagebox.showerror("Error", f"Error refreshing data: {str(e)}")
 
+    def refresh_exchange_rates(self):
+        # Cached rates are used as they are until they expire
+        if (not self.currency_converter.rates_are_fresh and
+                self.currency_converter.refresh_rates_async(self.rate_updates.put)):
+            self.root.after(200, self.poll_rate_updates)
+        self.root.after(RATE_REFRESH_INTERVAL_MS, self.refresh_exchange_rates)
+
+    def poll_rate_updates(self):
+        try:
+            rates = self.rate_updates.get_nowait()
+        except queue.Empty:
+            self.root.after(200, self.poll_rate_updates)
+            return
+
+        if rates is not None:
+            self.currency_converter.apply_rates(rates)
+            # Indexed spending is converted with the rates it was built from
+            self.rebuild_indexes()
+            self.on_currency_change()
+
+    def poll_save_errors(self):
+        # Failed background saves are reported by the persister's thread
+        try:
+            error = self.save_errors.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            messagebox.showerror(
+                "Error",
+                f"Error saving data: {str(error)}\n\nThe save will be retried."
+            )
+        self.root.after(1000, self.poll_save_errors)
+
+    def on_close(self):
+        try:
+            self.persister.flush()
+        except Exception as e:
+            if not messagebox.askyesno(
+                "Error",
+                f"Could not save your data:\n{str(e)}\n\nQuit anyway?"
+            ):
+                return
+        self.root.destroy()
+
     def on_currency_change(self, event=None):
         self.update_display()
         # Add explicit update for savings display
@@ -1669,6 +3530,11 @@ class BudgetTracker:
             self.update_savings_display()
 
 if __name__ == "__main__":
+    if "--migrate-to-sqlite" in sys.argv:
+        count = migrate_json_to_sqlite()
+        print(f"Migrated {count} transactions to {SQLITE_DB_PATH}")
+        sys.exit()
+
     root = tk.Tk()
     app = BudgetTracker(root)
     root.mainloop() 
\ No newline at end of file
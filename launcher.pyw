@@ -1,7 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+
+start = time.perf_counter()
+
 import tkinter as tk
 from budget_tracker import BudgetTracker
 
+imported = time.perf_counter()
+
+
+def print_import_times(limit=20):
+    """Slowest imports of budget_tracker, from `python -X importtime` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import budget_tracker"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms {name}")
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = BudgetTracker(root)
+
+    if "--importtime" in sys.argv:
+        # Measure cold start: imports, building the window and its first paint
+        root.update()
+        shown = time.perf_counter()
+        print(f"Imports: {(imported - start) * 1000:.0f}ms")
+        print(f"Time to first window: {(shown - start) * 1000:.0f}ms")
+        print_import_times()
+        # Through on_close, so queued saves are written before exiting
+        app.on_close()
+        sys.exit()
+
     root.mainloop() 
\ No newline at end of file
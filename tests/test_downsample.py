@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+
+from budget_tracker import downsample_series
+
+
+class DownsampleSeriesTest(unittest.TestCase):
+    def test_short_series_is_unchanged(self):
+        x = np.arange(10)
+        y = np.arange(10.0)
+        result_x, result_y = downsample_series(x, y, 100)
+        self.assertIs(result_x, x)
+        self.assertIs(result_y, y)
+
+    def test_keeps_ends_and_spikes(self):
+        x = np.arange(10_001)
+        y = np.sin(x / 500.0)
+        y[1234] = 50.0
+        y[8765] = -50.0
+        result_x, result_y = downsample_series(x, y, 200)
+        self.assertLessEqual(len(result_x), 204)
+        self.assertEqual((result_x[0], result_x[-1]), (0, 10_000))
+        self.assertTrue(np.all(np.diff(result_x) > 0))
+        self.assertIn(1234, result_x)
+        self.assertIn(8765, result_x)
+        np.testing.assert_array_equal(result_y, y[result_x])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from budget_tracker import SpendingIndex, Transaction, TransactionStore, TransactionTotals
+
+
+def transaction(amount, type_='expense', category='food', date='2024-01-15', currency='CZK'):
+    return Transaction(amount, type_, category, date=date, currency=currency)
+
+
+class SpendingIndexTest(unittest.TestCase):
+    def test_total_between_dates(self):
+        index = SpendingIndex([
+            transaction(10, date='2024-01-01'),
+            transaction(20, date='2024-01-15'),
+            transaction(40, date='2024-02-01'),
+            transaction(80, category='rent', date='2024-01-15'),
+            transaction(1000, type_='income', date='2024-01-15'),
+        ])
+        january = (Transaction(0, 'expense', date='2024-01-01').ordinal,
+                   Transaction(0, 'expense', date='2024-01-31').ordinal)
+        self.assertEqual(index.total('food', *january), 30)
+        self.assertEqual(index.total('rent', *january), 80)
+        self.assertEqual(index.total('travel', *january), 0)
+
+    def test_add_and_remove(self):
+        index = SpendingIndex()
+        t = transaction(25)
+        index.add(transaction(5))
+        index.add(t)
+        self.assertEqual(index.total('food', t.ordinal, t.ordinal), 30)
+        index.remove(t)
+        self.assertEqual(index.total('food', t.ordinal, t.ordinal), 5)
+
+    def test_convert(self):
+        index = SpendingIndex([transaction(10, currency='EUR')], convert=lambda t: t.amount * 25)
+        t = transaction(0)
+        self.assertEqual(index.total('food', t.ordinal, t.ordinal), 250)
+
+
+class TransactionTotalsTest(unittest.TestCase):
+    def test_totals_per_type_and_currency(self):
+        removed = transaction(7, currency='EUR')
+        totals = TransactionTotals([
+            transaction(10), transaction(5), transaction(100, type_='income'), removed
+        ])
+        totals.remove(removed)
+        totals.add(transaction(3, currency='USD'))
+        self.assertEqual(sorted(totals.rows()), [
+            ('expense', 'CZK', 15), ('expense', 'USD', 3), ('income', 'CZK', 100)
+        ])
+
+
+class TransactionStoreTest(unittest.TestCase):
+    def test_insert_remove_and_copy(self):
+        ledger = [transaction(i, date=f'2024-01-{i:02d}') for i in range(1, 6)]
+        store = TransactionStore(ledger)
+        copy = store.copy()
+
+        added = transaction(99, category='rent', date='2024-01-03', currency='EUR')
+        store.insert(3, added)
+        store.remove(ledger[0])
+        rows = [(t.id, t.amount, t.category, t.currency, t.date) for t in store]
+        expected = [(t.id, t.amount, t.category, t.currency, t.date)
+                    for t in ledger[1:3] + [added] + ledger[3:]]
+        self.assertEqual(rows, expected)
+        self.assertEqual([t.id for t in copy], [t.id for t in ledger])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+import unittest
+
+from budget_tracker import TransactionJournal
+
+
+class TransactionJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.journal = TransactionJournal(
+            snapshot_path=os.path.join(self.directory.name, 'transactions.json'),
+            log_path=os.path.join(self.directory.name, 'transactions.journal')
+        )
+
+    def transaction(self, transaction_id):
+        return {'id': transaction_id, 'amount': 10.0, 'type': 'expense', 'category': 'food',
+                'description': '', 'date': '2024-01-01', 'currency': 'CZK'}
+
+    def test_append_after_torn_line(self):
+        with open(self.journal.log_path, 'wb') as f:
+            f.write(b'{"op": "add", "id": "x", "transac')
+        self.journal.append([('add', 'y', self.transaction('y'))])
+        self.assertEqual(self.journal.load(), [self.transaction('y')])
+
+    def test_snapshot_layouts(self):
+        transactions = [self.transaction(str(i)) for i in range(300)]
+        self.journal.write_snapshot(transactions)
+        self.assertEqual(self.journal.load(), transactions)
+
+        # Rows spanning several lines fall back to parsing the whole file
+        for indent in (0, 4):
+            with open(self.journal.snapshot_path, 'w') as f:
+                json.dump(transactions, f, indent=indent)
+            self.assertEqual(self.journal.load(), transactions)
+
+
+if __name__ == '__main__':
+    unittest.main()
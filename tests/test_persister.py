@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from budget_tracker import WriteBehindPersister
+
+
+class WriteBehindPersisterTest(unittest.TestCase):
+    def test_background_failure_is_reported(self):
+        reported = threading.Event()
+        errors = []
+
+        def on_error(error):
+            errors.append(error)
+            reported.set()
+
+        def write():
+            raise OSError("disk full")
+
+        persister = WriteBehindPersister(delay=0.01, on_error=on_error)
+        persister.save('budgets', write)
+        self.assertTrue(reported.wait(5))
+        self.assertEqual([str(e) for e in errors], ["disk full"])
+
+        # A newer save replaces the failed one and is written by flush
+        written = []
+        persister.save('budgets', lambda: written.append(True))
+        persister.flush()
+        self.assertEqual(written, [True])
+
+    def test_failing_error_handler_keeps_writer_running(self):
+        reported = threading.Event()
+
+        def on_error(error):
+            reported.set()
+            raise RuntimeError("no window")
+
+        def write():
+            raise OSError("disk full")
+
+        persister = WriteBehindPersister(delay=0.01, on_error=on_error)
+        persister.save('budgets', write)
+        self.assertTrue(reported.wait(5))
+
+        written = threading.Event()
+        persister.save('budgets', written.set)
+        self.assertTrue(written.wait(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from budget_tracker import CurrencyConverter, RateHistory
+
+
+class RateHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_rate_on(self):
+        history = RateHistory('CZK', self.directory.name)
+        self.assertIsNone(history.rate_on('EUR', date(2024, 1, 1).toordinal()))
+
+        history.record({'EUR': 0.040, 'CZK': 1.0}, ['CZK', 'EUR'], date(2024, 1, 10))
+        history.record({'EUR': 0.042}, ['EUR'], date(2024, 1, 20))
+        # Recorded out of order
+        history.record({'EUR': 0.041}, ['EUR'], date(2024, 1, 15))
+        history.record({'EUR': None}, ['EUR'], date(2024, 1, 25))
+
+        # Read back from disk
+        history = RateHistory('CZK', self.directory.name)
+        rate_on = lambda day: history.rate_on('EUR', day.toordinal())
+        self.assertEqual(rate_on(date(2024, 1, 1)), 0.040)
+        self.assertEqual(rate_on(date(2024, 1, 14)), 0.040)
+        self.assertEqual(rate_on(date(2024, 1, 15)), 0.041)
+        self.assertEqual(rate_on(date(2024, 2, 1)), 0.042)
+        self.assertIsNone(history.rate_on('CZK', date(2024, 1, 10).toordinal()))
+
+        ordinals = np.array([date(2024, 1, d).toordinal() for d in (1, 15, 31)])
+        self.assertEqual(list(history.rates_on('EUR', ordinals)), [0.040, 0.041, 0.042])
+
+    def test_rerecording_a_day_replaces_its_rate(self):
+        history = RateHistory('CZK', self.directory.name)
+        history.record({'USD': 0.043}, ['USD'], date(2024, 3, 1))
+        history.record({'USD': 0.044}, ['USD'], date(2024, 3, 1))
+        history = RateHistory('CZK', self.directory.name)
+        self.assertEqual(history.rate_on('USD', date(2024, 3, 1).toordinal()), 0.044)
+
+
+class ConvertManyTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.converter = CurrencyConverter(
+            rate_source=object(), cache_path=os.path.join(directory.name, 'exchange_rates.json')
+        )
+        self.converter.history = RateHistory('CZK', directory.name)
+        self.converter.rates = {'EUR': 0.04, 'USD': 0.05}
+        self.converter.history.record({'EUR': 0.05}, ['EUR'], date(2024, 1, 1))
+        self.converter.history.record({'EUR': 0.04}, ['EUR'], date(2024, 6, 1))
+        self.days = [date(2024, 2, 1).toordinal(), date(2024, 7, 1).toordinal(),
+                     date(2024, 7, 1).toordinal()]
+
+    def test_lists(self):
+        converted = self.converter.convert_many([100, 4, 5], ['CZK', 'EUR', 'USD'], 'CZK')
+        self.assertEqual([round(amount, 6) for amount in converted], [100, 100, 100])
+
+    def test_lists_at_transaction_dates(self):
+        converted = self.converter.convert_many([5, 4, 100], ['EUR', 'EUR', 'CZK'], 'CZK', self.days)
+        self.assertEqual([round(amount, 6) for amount in converted], [100, 100, 100])
+
+    def test_arrays_match_lists(self):
+        amounts = [5.0, 4.0, 100.0]
+        currencies = ['EUR', 'EUR', 'CZK']
+        expected = self.converter.convert_many(amounts, currencies, 'USD', self.days)
+        converted = self.converter.convert_many(np.array(amounts), currencies, 'USD', self.days)
+        np.testing.assert_allclose(converted, expected)
+
+        # Integer codes into a list of currency names
+        converted = self.converter.convert_many(
+            np.array(amounts), [1, 1, 0], 'USD', self.days, currency_names=['CZK', 'EUR']
+        )
+        np.testing.assert_allclose(converted, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from budget_tracker import JsonStorage, SQLiteStorage, migrate_json_to_sqlite
+
+
+def transaction(transaction_id, date='2024-01-01', amount=10.0):
+    return {'id': transaction_id, 'amount': amount, 'type': 'expense', 'category': 'food',
+            'description': '', 'date': date, 'currency': 'CZK'}
+
+
+BUDGETS = {'food': {'amount': 5000.0, 'period': 'monthly', 'currency': 'CZK'}}
+SAVINGS_GOALS = {
+    'bike': {'target': 20000.0, 'current': 1500.0, 'monthly': 1000.0, 'deadline': '2025-06-01',
+             'contributions': [{'amount': 500.0, 'date': '2024-01-01'},
+                               {'amount': 1000.0, 'date': '2024-02-01'}],
+             'currency': 'CZK'}
+}
+
+
+class SQLiteStorageTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'budget_tracker.db')
+        self.storage = SQLiteStorage(self.path)
+        self.addCleanup(self.storage.conn.close)
+
+    def test_transactions(self):
+        self.storage.save_transactions([transaction('a', '2024-01-01'), transaction('b', '2024-03-01')])
+        self.storage.record_transactions([
+            ('add', 'c', transaction('c', '2024-02-01')),
+            ('edit', 'a', transaction('a', '2024-01-01', amount=20.0)),
+            ('delete', 'b', None),
+        ])
+        self.assertEqual(self.storage.load_transactions(), [
+            transaction('c', '2024-02-01'), transaction('a', '2024-01-01', amount=20.0)
+        ])
+
+    def test_budgets_and_savings_goals(self):
+        self.storage.save_budgets(BUDGETS)
+        self.storage.save_savings_goals(SAVINGS_GOALS)
+        self.assertEqual(self.storage.load_budgets(), BUDGETS)
+        self.assertEqual(self.storage.load_savings_goals(), SAVINGS_GOALS)
+
+    def test_savings_goals_version_changes_on_other_connections_commit(self):
+        version = self.storage.savings_goals_version()
+        other = SQLiteStorage(self.path)
+        self.addCleanup(other.conn.close)
+        other.save_savings_goals(SAVINGS_GOALS)
+        self.assertNotEqual(self.storage.savings_goals_version(), version)
+
+
+class MigrateJsonToSqliteTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        # The JSON files are read from the working directory
+        os.chdir(directory.name)
+
+    def test_migrate(self):
+        source = JsonStorage()
+        source.save_transactions([transaction('a', '2024-02-01'), transaction('a', '2024-01-01')])
+        source.save_budgets(BUDGETS)
+        source.save_savings_goals(SAVINGS_GOALS)
+
+        self.assertEqual(migrate_json_to_sqlite('budget_tracker.db'), 2)
+        target = SQLiteStorage('budget_tracker.db')
+        self.addCleanup(target.conn.close)
+        transactions = target.load_transactions()
+        # Duplicate ids get a new one instead of overwriting each other
+        self.assertEqual([t['date'] for t in transactions], ['2024-02-01', '2024-01-01'])
+        self.assertEqual(len({t['id'] for t in transactions}), 2)
+        self.assertEqual(target.load_budgets(), BUDGETS)
+        self.assertEqual(target.load_savings_goals(), SAVINGS_GOALS)
+
+        with self.assertRaises(FileExistsError):
+            migrate_json_to_sqlite('budget_tracker.db')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from budget_tracker import Transaction
+
+
+class TransactionTest(unittest.TestCase):
+    def test_from_dict_round_trip(self):
+        t_dict = {'id': '20240101120000000000', 'amount': 12.5, 'type': 'expense', 'category': 'food',
+                  'description': 'Lunch', 'date': '2024-01-01', 'currency': 'EUR'}
+        self.assertEqual(Transaction.from_dict(t_dict).to_dict(), t_dict)
+
+    def test_from_dict_defaults(self):
+        t = Transaction.from_dict({'id': 'a', 'amount': 1, 'type': 'income', 'category': None,
+                                   'description': '', 'date': '2024-01-01'})
+        self.assertEqual((t.amount, t.category, t.currency), (1.0, '', 'CZK'))
+
+
+if __name__ == '__main__':
+    unittest.main()